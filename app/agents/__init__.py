@@ -4,7 +4,7 @@ Agent module for AI-powered booking and admin assistants.
 This module contains the agent implementations and their tools.
 """
 
-from app.agents.booking_agent import BookingToolAgent
+from app.agents.booking_agent import BookingToolAgent, get_booking_agent
 from app.agents.admin_agent import AdminAgent
 
-__all__ = ['BookingToolAgent', 'AdminAgent']
+__all__ = ['BookingToolAgent', 'get_booking_agent', 'AdminAgent']
@@ -1,18 +1,16 @@
-from datetime import date
-from xml.parsers.expat import model
-from dotenv import load_dotenv
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+import asyncio
+import logging
+import re
+from typing import List, Tuple
+
+from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.prebuilt import create_react_agent
+
 from app.database import SessionLocal
-from app.models import Session, Message
-from app.core.config import settings
+from app.models import Session
 from app.agents.llm_factory import get_llm
-
-import os
-from sqlalchemy import text
-from typing import List, Tuple, Optional, Dict
-from datetime import datetime
-from langchain_core.messages import HumanMessage, AIMessage
+from app.agents.tool_node import BookingToolNode
+from app.repositories.message_repository import MessageRepository
 
 # Import refactored payment tools from new structure
 from app.agents.tools.payment_tools import (
@@ -20,6 +18,29 @@ from app.agents.tools.payment_tools import (
     reject_booking_payment
 )
 
+logger = logging.getLogger(__name__)
+
+# Admin commands only need recent context; older history is never consulted
+ADMIN_HISTORY_LIMIT = 20
+
+_message_repo = MessageRepository()
+
+# "confirm <booking_id>" / "reject <booking_id> [reason]". Booking IDs are
+# "<name>-<YYYY-MM-DD>-<shift>" and names/shifts may contain spaces, so the
+# ID is anchored on its date and shift rather than on whitespace.
+_ADMIN_COMMAND_RE = re.compile(
+    r"^\s*(?P<action>confirm|reject)\s+`?"
+    r"(?P<booking_id>.+?-\d{4}-\d{2}-\d{2}-(?:Full Day|Full Night|Day|Night))`?"
+    r"(?:\s+(?P<reason>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Stored senders -> LangChain message classes; anything else is the bot
+_SENDER_CLASSES = {
+    "user": HumanMessage,
+    "admin": HumanMessage
+}
+
 system_prompt = """
 You are *ADMIN BOT*, you will receive a verification message from *HutFarm-Booking AI*, you will wait until admin verifies payment details, then you will send a message to the user that their booking is confirmed or cancelled
 with the reason of cancellation.
@@ -31,11 +52,32 @@ When admin says "confirm <booking_id>", you MUST use the confirm_booking_payment
 When admin says "reject <booking_id> [reason]", you MUST use the reject_booking_payment tool.
 
 The tools will return a response containing customer_phone and message - you must return this data so the webhook can send it to the customer.
-
-Chat History:
-{chat_history}
 """
 
+
+def _load_admin_history(session_id: str) -> List[Tuple[str, str]]:
+    """
+    Load the latest (sender, content) pairs for the admin session's user.
+    
+    Args:
+        session_id: Admin session ID
+        
+    Returns:
+        Up to ADMIN_HISTORY_LIMIT (sender, content) tuples, oldest first
+    """
+    with SessionLocal() as db:
+        # The FK column is all we need; going through session.user would
+        # issue a second SELECT against users
+        user_id = (
+            db.query(Session.user_id)
+            .filter(Session.id == session_id)
+            .scalar()
+        )
+        if user_id is None:
+            raise ValueError(f"Session {session_id} not found")
+        return _message_repo.get_recent_turns(db, user_id, ADMIN_HISTORY_LIMIT)
+
+
 class AdminAgent:
     def __init__(self):
         # ✅ Add the booking tools
@@ -44,64 +86,54 @@ class AdminAgent:
         # Get LLM based on configuration
         self.llm = get_llm(temperature=0)
 
-        self.prompt = ChatPromptTemplate(
-            [
-                ("system", system_prompt),
-                MessagesPlaceholder(variable_name="messages"),
-            ]
-        )
-
+        # Static system prompt leads every request so the prefix stays
+        # identical across turns; chat history follows as plain messages
         self.agent = create_react_agent(
             model=self.llm,
-            tools=self.tools,
-            prompt=self.prompt
+            tools=BookingToolNode(self.tools),
+            state_modifier=system_prompt
         )
     
-    def convert_messages_to_langchain_format(self, messages: List[Message]) -> List:
-        """Convert database Message objects to LangChain message format"""
-        langchain_messages = []
+    def convert_messages_to_langchain_format(self, messages) -> List:
+        """
+        Convert stored messages to LangChain messages in a single pass.
         
-        for msg in messages:
-            # Assuming your Message model has 'content' and 'sender_type' or similar fields
-            # Adjust these field names based on your actual Message model structure
+        Args:
+            messages: Message objects or (sender, content) result rows
             
-            if hasattr(msg, 'sender') and msg.sender == 'user':
-                langchain_messages.append(HumanMessage(content=msg.content))
-            elif hasattr(msg, 'sender') and msg.sender == 'admin':
-                langchain_messages.append(HumanMessage(content=msg.content))
-            else:
-                # Default to AI message if it's from the bot
-                langchain_messages.append(AIMessage(content=msg.content))
-                
-        return langchain_messages
+        Returns:
+            List of HumanMessage (user/admin) and AIMessage (bot) objects
+        """
+        return [
+            _SENDER_CLASSES.get(msg.sender, AIMessage)(content=msg.content)
+            for msg in messages
+        ]
         
-    def get_response(self, incoming_text: str, session_id: str):
-        db = SessionLocal()
+    async def get_response(self, incoming_text: str, session_id: str):
         try:
-            session = db.query(Session).filter_by(id=session_id).first()
-            user_id = session.user.user_id
-            # --- Get chat history and convert to LangChain format ---
-            chat_history_objects = db.query(Message).filter_by(user_id=user_id).order_by(Message.timestamp.asc()).all()
-            chat_history = self.convert_messages_to_langchain_format(chat_history_objects)
-            
-            print(f"Chat history converted: {len(chat_history)} messages")
+            # Well-formed commands map 1:1 onto a tool call; run it directly
+            # and keep the model for anything free-form
+            command = _ADMIN_COMMAND_RE.match(incoming_text)
+            if command:
+                return await self._run_command(command)
             
-            print(f"📥 Admin input: {incoming_text}")
+            # Blocking DB reads run off the event loop
+            chat_history_rows = await asyncio.to_thread(_load_admin_history, session_id)
+            messages = self.convert_messages_to_langchain_format(chat_history_rows)
             
-            # Convert chat history to messages format
-            messages = []
-            for msg in chat_history:
-                messages.append(msg)
+            logger.debug("Chat history converted: %d messages", len(messages))
+            logger.debug("📥 Admin input: %s", incoming_text)
             
             # Add current message
             messages.append(HumanMessage(content=incoming_text))
             
             # Run agent with context
-            response = self.agent.invoke({
+            response = await self.agent.ainvoke({
                 "messages": messages,
             })
             
-            print(f"🤖 Agent response: {response}")
+            # Full agent state (every message and tool output)
+            logger.debug("🤖 Agent response: %s", response)
             
             # Extract the final message content
             if response and "messages" in response:
@@ -110,7 +142,32 @@ class AdminAgent:
             return str(response)
             
         except Exception as e:
-            print(f"❌ Error in AdminAgent: {e}")
+            logger.error("❌ Error in AdminAgent: %s", e)
             return {"error": f"Error processing admin request: {str(e)}"}
-        finally:
-            db.close()
+    
+    async def _run_command(self, command: re.Match) -> str:
+        """
+        Run a parsed confirm/reject command without calling the model.
+        
+        Args:
+            command: _ADMIN_COMMAND_RE match
+            
+        Returns:
+            The tool's customer message on success, otherwise its error text
+        """
+        booking_id = command["booking_id"]
+        
+        if command["action"].lower() == "confirm":
+            tool, args = confirm_booking_payment, {"booking_id": booking_id}
+        else:
+            tool, args = reject_booking_payment, {"booking_id": booking_id}
+            # The tool's schema types reason as str; without one it answers
+            # with its own "reason is required" error
+            if command["reason"] is not None:
+                args["reason"] = command["reason"]
+        
+        logger.debug("⚡ Admin command %s for %s (no LLM call)", tool.name, booking_id)
+        
+        # The payment tools are blocking (DB + WhatsApp send)
+        result = await asyncio.to_thread(tool.invoke, args)
+        return result.get("message") or result.get("error") or str(result)
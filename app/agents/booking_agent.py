@@ -1,16 +1,19 @@
-from datetime import date
-from xml.parsers.expat import model
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+import asyncio
+import logging
+import textwrap
+import threading
+from datetime import date, datetime
 from langgraph.prebuilt import create_react_agent
-from datetime import date
+from langgraph.prebuilt.chat_agent_executor import AgentState
+from sqlalchemy.orm import Session as DBSession, joinedload
 from app.database import SessionLocal
-from app.models import Session, Message
-from sqlalchemy import text
-from typing import List, Tuple, Optional, Dict
-from datetime import datetime
-from langchain_core.messages import HumanMessage, AIMessage
 from app.core.config import settings
-from app.agents.llm_factory import get_llm, get_embedding_function
+from app.models import Session, Message
+from typing import AsyncIterator, Optional, Dict, List, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from app.agents.llm_factory import get_llm
+from app.agents.memory import MemoryContext, prepare_memory
+from app.agents.tool_node import BookingToolNode
 
 # Import refactored agent tools from new structure
 from app.agents.tools.booking_tools import (
@@ -44,7 +47,10 @@ from app.agents.tools.payment_tools import (
 from app.agents.tools.utility_tools import (
     check_message_relevance,
     check_booking_date,
-    send_booking_intro
+    send_booking_intro,
+    is_greeting,
+    is_obviously_relevant,
+    BOOKING_INTRO_MESSAGE
 )
 
 # Import session management tools
@@ -52,91 +58,12 @@ from app.agents.tools.session_tools import (
     set_booking_preferences
 )
 
-# system_prompt = """
-# Assalam-u-Alaikum! I'm HutBuddy AI — your friendly booking assistant for huts and farmhouses.
-# I'll help you find, book, and confirm relaxing getaways — right here on WhatsApp.
-
-# **Main Services**
-# - Search available huts/farmhouses with filters (price, size, features)
-# - Check availability for specific dates and shifts
-# - Provide detailed information with images/videos
-# - Guide through the booking process and payments
-# - Confirm payments and manage bookings
-
-# **Communication Rules**
-# - **Language**: Match the user's language (English/Roman Urdu). Always use respectful language
-# - **Terminology**: Always say "farmhouse"/"hut", never "property"
-# - **Boundaries**: Only discuss booking-related topics
-# - **Creator**: If asked who made me → "I am a product of Prismify-Core"
-# - **Irrelevant queries** → "I can only help with farmhouse and hut bookings. Would you like me to help you find a farmhouse or hut?"
-# - **Greetings**: When user greets you (hi, hello, salam), use `send_booking_intro()` tool to send a formatted introduction with booking instructions
-
-# **Date & Booking Logic**
-# - **Input Mapping**: "farmhouse/farmhouses" → farm | "hut/huts" → hut  
-# - **Shifts**: Day, Night, Full Day, Full Night only
-# - **Date Validation**:
-#   - Only bookings for the current or next month are allowed
-#   - Past dates → "This date is in the past, please select a future date"
-#   - Relative dates ("Sunday night") → Extract and confirm the exact date
-# - **Smart Recognition**:
-#   - Partial names: "White Palace" → "White Palace FarmHouse"
-#   - Numbers: "1st", "second", "#2" → Select from the list
-#   - Misspellings: Auto-correct common mistakes
-
-# **Security & Privacy**
-# - Never show internal IDs (booking_id, property_id) to users
-# - Always use user-friendly booking references only
-# - Require authentication before showing personal booking details
-# - Keep all interactions appropriate and family-friendly
-
-# **CRITICAL: Tool Usage Workflow**
-# **STEP 1: Check Relevance**
-# - ALWAYS call `check_message_relevance()` FIRST for every user message
-# - If irrelevant, politely redirect to booking topics
-
-# **STEP 2: Capture User Preferences**
-# - When user mentions property type, date, shift, price, or guests → IMMEDIATELY call `set_booking_preferences()`
-# - Examples:
-#   * "I want a farmhouse" → set_booking_preferences(property_type="farm")
-#   * "15th January, day shift" → set_booking_preferences(booking_date="2026-01-15", shift_type="Day")
-#   * "for 10 people under 5000" → set_booking_preferences(max_occupancy=10, max_price=5000)
-# - This tool will save preferences AND tell you what's still missing
-# - Use the tool's response to guide the conversation
-
-# **STEP 3: Property Name Resolution**
-# - If user mentions a property name → MUST call `get_property_id_from_name()` FIRST
-# - This stores property_id in session for other tools to use
-# - Examples: "White Palace", "Seaside", "farmhouse number 2"
-
-# **STEP 4: Execute Appropriate Tool**
-# - **Setting preferences**: Use `set_booking_preferences()` - when user mentions type/date/shift/price/guests
-# - **Searching properties**: Use `list_properties()` - requires property_type, date, shift_type
-# - **Property details**: Use `get_property_details()` - requires property_id (call get_property_id_from_name first!)
-# - **Pricing info**: Use `get_property_pricing()` - requires property_id
-# - **Images ONLY**: Use `get_property_images()` - requires property_id
-# - **Videos ONLY**: Use `get_property_videos()` - requires property_id
-# - **Both images AND videos**: Use `get_property_media()` - requires property_id
-# - **Creating booking**: Use `create_booking()` - requires all booking details
-# - **Payment**: Use `process_payment_details()` or `process_payment_screenshot()`
-
-# **STEP 5: Use Session Context Intelligently**
-# - If session has property_type but user asks for list → use existing property_type
-# - If session has booking_date but user asks for availability → use existing date
-# - Don't ask for information that's already in session context
-
-# **Response Templates:**
-# - Date Confirmation: "Do you mean [extracted_date] ([day_name])? Please confirm."
-# - Authentication needed: "To view booking details, we first need to verify your contact."
-# - Missing info: "To show you available [farmhouses/huts], I need: [list missing info]"
-
-# Use chat history for context and continuity.
-
-# **Session Context**
-# ID: {session_id} | Name: {name} | Date: {date}  
-# Current Search: {property_type} | {booking_date} | {shift_type} | Price Range: {min_price}-{max_price} | Guests: {max_occupancy}
-# """
-
-system_prompt = """
+logger = logging.getLogger(__name__)
+
+# Static instructions - byte-identical on every call. Keep this block first
+# and free of placeholders: OpenAI and Gemini both cache repeated prompt
+# prefixes automatically, so per-session values must only come after it.
+STATIC_SYSTEM_PROMPT = """
 ROLE
 You are HutBuddy AI, a WhatsApp booking assistant that helps users search, evaluate, and book farmhouses or huts.
 Primary Goal: Guide users from discovery → booking → payment → confirmation efficiently and politely.
@@ -169,6 +96,7 @@ Security:
 
 STEPS (MANDATORY TOOL FLOW)
 1. Relevance Check (ALWAYS FIRST) -> CALL: check_message_relevance()
+Skip this call when SESSION CONTEXT shows "Relevance: pre-checked" (already verified as booking-related).
 If irrelevant → Introduce yourself and tell what you can do.
 
 2. Capture Preferences
@@ -185,10 +113,9 @@ Required before using property tools.
 - Pricing: get_property_pricing(property_id)
 - Media: get_property_images(property_id), get_property_videos(property_id), get_property_media(property_id)
 - Booking: create_booking()
-- Payment: process_payment_details(), process_payment_screenshot()
 
 5. Session Awareness
-Use existing session values. Never re-ask known info.
+Check SESSION CONTEXT first. Use existing values (type, date, shift, price, guests) and never re-ask them; only ask for values that are None.
 
 EXPECTATIONS
 Date Rules:
@@ -204,8 +131,6 @@ Property Type Question:
 - When asking about property type, present as choice: "What type of property are you looking for? Farm or Hut?"
 - NEVER ask as open text - always present the two options
 
-Supported Property type: farmhouse, huts
-
 Supported Shifts (ALL 4 MUST BE INCLUDED):
 - Day
 - Night  
@@ -223,20 +148,14 @@ NARROWING (Hard Constraints)
 You MUST:
 - Always follow tool order
 - Never guess availability, pricing, or booking status
-- Never skip relevance check
+- Never skip relevance check (unless SESSION CONTEXT shows "Relevance: pre-checked")
 - Never call property tools without property_id
+- When several lookups need only the same known property_id (details, pricing, images, videos), call them together in ONE step instead of one per turn
 - Prefer tool data over assumptions
 - Keep replies short
 - Prioritize booking completion
 
 CRITICAL BOOKING FLOW RULES:
-- **GREETING TOOL**: ALWAYS call send_booking_intro() tool when:
-  * User says: hi, hello, salam, hey, assalam, or any greeting
-  * OR it is a new chat with no conversation summary
-  * DO NOT write manual greeting responses - ALWAYS use the tool
-- **SHIFT TYPES**: When asking for shift type, ALWAYS include ALL 4 options: Day, Night, Full Day, Full Night
-  * NEVER skip "Full Night" option
- 
 - When user asks for property details/images → Show them WITHOUT asking booking questions
 - After showing details, ask: "Would you like to proceed with booking this farmhouse? or you want to explore"
 
@@ -269,21 +188,16 @@ CRITICAL BOOKING FLOW RULES:
    **NEVER call create_booking without prepare_booking_details returning ready=true!**
 
 4. If browsing → Don't force booking
+"""
 
-
-SESSION AWARENESS:
-- NEVER re-ask for information already in session (property_type, booking_date, shift_type, etc.)
-- If session has property_type → Don't ask again, use it
-- If session has booking_date → Don't ask again, use it
-- If session has shift_type → Don't ask again, use it
-- Only ask for MISSING/None information
-- Check session context before asking any questions
-
+# Per-turn session context, appended after the static instructions
+SESSION_CONTEXT_PROMPT = """
 **SESSION CONTEXT**
 Session: {session_id}
 User: {name}
 User CNIC: {cnic}
 Date: {date}
+Relevance: {relevance}
 
 Search:
 Type: {property_type}
@@ -293,119 +207,423 @@ Price: {min_price}-{max_price}
 Guests: {max_occupancy}
 """
 
-from sqlalchemy import desc
+# Added to the session context only when the payment submission tools are
+# bound (see _select_agent); the static prompt must not name unbound tools
+PAYMENT_TOOLS_PROMPT = """
+Payment: process_payment_details(), process_payment_screenshot()
+"""
+
+
+
+class BookingAgentState(AgentState):
+    """Agent state plus the per-turn session context for the system prompt."""
+    session_context: str
+
+
+def _with_system_prompt(state: BookingAgentState) -> List[BaseMessage]:
+    """
+    Prepend the system prompt for this turn to the conversation.
+    
+    The static instructions come first, byte-identical on every call, and
+    the turn's session context follows. Everything is sent as one leading
+    SystemMessage (Gemini rejects system messages anywhere but first).
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        Messages to send to the model
+    """
+    return [
+        SystemMessage(content=STATIC_SYSTEM_PROMPT + state["session_context"]),
+        *state["messages"]
+    ]
 
 # Note: get_chat_history_normal() has been replaced by the memory system
 # See app/agents/memory/memory_manager.py for the new implementation
 
 
+# Internal trigger sent by the webhook after a payment screenshot upload;
+# it is an instruction to the agent, not a user message
+PAYMENT_SCREENSHOT_TRIGGER = "Image received run process_payment_screenshot"
+
+# Sent for bare greetings; same text send_booking_intro() returns
+_GREETING_REPLY = textwrap.dedent(BOOKING_INTRO_MESSAGE).strip()
+
+# Memory roles -> LangChain message classes
+_MESSAGE_CLASSES = {
+    "user": HumanMessage,
+    "assistant": AIMessage
+}
+
+
+def _load_session_with_user(db: DBSession, session_id: str) -> Optional[Session]:
+    """Fetch a session and its user in one SELECT (name/cnic/email are all read)."""
+    return (
+        db.query(Session)
+        .options(joinedload(Session.user))
+        .filter_by(id=session_id)
+        .first()
+    )
+
+
+def _user_context(session: Optional[Session], session_id: str) -> Dict[str, Optional[str]]:
+    """
+    Extract the user fields the prompt needs from a loaded session.
+    
+    Args:
+        session: Session loaded with its user, or None
+        session_id: Session ID (for the error message)
+        
+    Returns:
+        Dict with user_id, name, cnic and email
+    """
+    user = session.user if session else None
+    
+    if user is None:
+        raise ValueError(f"Session {session_id} not found")
+    
+    return {
+        "user_id": user.user_id,
+        "name": user.name,
+        "cnic": user.cnic,
+        "email": user.email
+    }
+
+
+def _load_user_context(session_id: str) -> Dict[str, Optional[str]]:
+    """
+    Load the user fields the prompt needs for a session.
+    
+    Args:
+        session_id: Session ID
+        
+    Returns:
+        Dict with user_id, name, cnic and email
+    """
+    with SessionLocal() as db:
+        return _user_context(_load_session_with_user(db, session_id), session_id)
+
+
+def _load_turn_context(session_id: str, incoming_text: str) -> Tuple[Dict[str, Optional[str]], MemoryContext]:
+    """
+    Load the user fields and memory context for a turn on one connection.
+    
+    The session row (with its user) is read once; prepare_memory() then
+    gets it from this DB session's identity map instead of querying again,
+    so a turn costs two SELECTs on one pooled connection.
+    
+    Args:
+        session_id: Session ID
+        incoming_text: New user message
+        
+    Returns:
+        (user_context, memory_context)
+    """
+    with SessionLocal() as db:
+        # Keep a strong reference: the identity map only holds objects weakly
+        session = _load_session_with_user(db, session_id)
+        user_context = _user_context(session, session_id)
+        memory_context = prepare_memory(session_id=session_id, incoming_text=incoming_text, db=db)
+    
+    return user_context, memory_context
+
+
+def _persist_user_message(user_id, incoming_text: str, whatsapp_message_id: Optional[str]) -> None:
+    """
+    Save an incoming user message, detecting form submissions.
+    
+    Args:
+        user_id: User ID
+        incoming_text: Message text
+        whatsapp_message_id: WhatsApp message ID (None for web chat)
+    """
+    is_form = is_form_submission(incoming_text)
+    form_data = None
+    
+    if is_form:
+        form_data = parse_form_submission(incoming_text)
+        logger.debug("📝 Form submission detected: %s", form_data)
+    
+    with SessionLocal() as db:
+        db.add(Message(
+            user_id=user_id,
+            sender="user",
+            content=incoming_text,
+            whatsapp_message_id=whatsapp_message_id,
+            timestamp=datetime.utcnow(),
+            form_data=form_data,
+            is_form_submission=is_form
+        ))
+        db.commit()
+
+
+def _takes_payment(incoming_text: str, memory_context: MemoryContext) -> bool:
+    """Whether this turn gets the payment submission tools (booking exists or a screenshot arrived)."""
+    return bool(memory_context.session_state.get("booking_id")) or incoming_text == PAYMENT_SCREENSHOT_TRIGGER
+
+
+async def _finish_persist(persist_task: Optional[asyncio.Task], session_id: str) -> None:
+    """
+    Wait for the user-message save started by _start_turn().
+    
+    A failed save is logged, never raised: by now the agent may already have
+    run tools such as create_booking, so its reply must not be thrown away
+    (and an exception from the agent itself must not be masked).
+    
+    Args:
+        persist_task: Task returned by _start_turn(), or None
+        session_id: Session ID (for the log message)
+    """
+    if persist_task is None:
+        return
+    
+    try:
+        await persist_task
+    except Exception:
+        logger.exception("Failed to save user message for session %s", session_id)
+
+
+# Tools exposed to the booking agent (order is the order shown to the model)
+BOOKING_TOOLS = (
+    set_booking_preferences,
+    list_properties,
+    get_property_pricing,
+    get_property_details,
+    get_property_images,
+    get_property_videos,
+    get_property_id_from_name,
+    prepare_booking_details,
+    create_booking,
+    check_booking_status,
+    process_payment_screenshot,
+    process_payment_details,
+    get_payment_instructions,
+    check_message_relevance,
+    check_booking_date,
+    get_user_bookings,
+    send_booking_intro,
+)
+
+# Payment proof can only follow a booking, so these schemas are left out of
+# the model request until the session has a booking_id (see _select_agent)
+PAYMENT_SUBMISSION_TOOLS = (
+    process_payment_screenshot,
+    process_payment_details,
+)
+
+
 class BookingToolAgent:
     def __init__(self):
-        self.tools = [
-            set_booking_preferences,
-            list_properties,
-            get_property_pricing,
-            get_property_details,
-            get_property_images,
-            get_property_videos,
-            get_property_id_from_name,
-            prepare_booking_details,
-            create_booking,
-            check_booking_status,
-            process_payment_screenshot,
-            process_payment_details,
-            get_payment_instructions,
-            check_message_relevance,
-            check_booking_date,
-            get_user_bookings,
-            send_booking_intro
-        ]
+        self.tools = list(BOOKING_TOOLS)
+        
+        # Read-only tools from one model step run in parallel; tools that
+        # write session/booking state run one at a time
+        self.tool_node = BookingToolNode(self.tools)
         
         # Get LLM based on configuration (NO structured output here)
         self.llm = get_llm(temperature=0)
-        
-        # Get embedding function based on configuration
-        self.embed_fn = get_embedding_function()
 
-        self.prompt = ChatPromptTemplate(
-            [
-                ("system", system_prompt),
-                MessagesPlaceholder(variable_name='messages'),
-            ]
-        )
-
-        self.agent = create_react_agent(
+        # Compiled once and shared by every turn; the per-turn session
+        # context travels in the graph state (see _with_system_prompt)
+        self.agent = self._compile_agent(self.tool_node)
+        
+        # Same graph without the payment submission tools, for sessions that
+        # have no booking yet - every model call sends fewer tool schemas
+        self.pre_booking_agent = self._compile_agent(BookingToolNode([
+            tool for tool in self.tools if tool not in PAYMENT_SUBMISSION_TOOLS
+        ]))
+    
+    def _compile_agent(self, tool_node: BookingToolNode):
+        return create_react_agent(
             model=self.llm,
-            tools=self.tools,
-            state_modifier=self.prompt
+            tools=tool_node,
+            state_schema=BookingAgentState,
+            state_modifier=_with_system_prompt,
+            debug=settings.AGENT_VERBOSE
         )
-
-  
-    def get_embedding(self, text: str, task_type: str = "retrieval_document") -> List[float]:
+    
+    def _select_agent(self, incoming_text: str, memory_context):
+        """
+        Pick the compiled graph whose tool set fits the session.
+        
+        Returns:
+            The full agent once a booking exists (or a payment screenshot
+            arrived), otherwise the agent without payment submission tools
         """
-        Generate an embedding for the given text using configured LLM provider.
+        if _takes_payment(incoming_text, memory_context):
+            return self.agent
+        return self.pre_booking_agent
 
+    async def get_response(self, incoming_text: str, session_id: str, whatsapp_message_id: Optional[str]= None):
+        if is_greeting(incoming_text):
+            return await self._answer_greeting(incoming_text, session_id, whatsapp_message_id)
+        
+        user_context, memory_context, persist_task = await self._start_turn(
+            incoming_text, session_id, whatsapp_message_id
+        )
+        
+        try:
+            return await self._run_agent(incoming_text, session_id, user_context, memory_context)
+        finally:
+            await _finish_persist(persist_task, session_id)
+    
+    async def get_response_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str]]],
+        max_concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        Answer a burst of messages, running independent sessions concurrently.
+        
+        Messages for the same session are answered one after another in the
+        order given, so each turn sees the previous one's history and state;
+        different sessions share the compiled agents and DB pool and run up
+        to max_concurrency at a time.
+        
         Args:
-            text (str): The text to embed.
-            task_type (str): Task type hint (used by some providers like Gemini).
-
+            items: (incoming_text, session_id, whatsapp_message_id) tuples
+            max_concurrency: Sessions in flight at once
+                (default: settings.AGENT_BATCH_CONCURRENCY)
+            
         Returns:
-            List[float]: A list of embedding floats.
-            - OpenAI: 1536 dimensions (text-embedding-3-small)
-            - Gemini: 768 dimensions (embedding-001)
+            One reply per item, in input order
         """
-        return self.embed_fn(text)
-
-    def get_response(self, incoming_text: str, session_id: str, whatsapp_message_id: Optional[str]= None):
-        db = SessionLocal()
-        session = db.query(Session).filter_by(id=session_id).first()
-
-        # --- Save user message ---
-        user_id = session.user.user_id
-
-        if incoming_text != "Image received run process_payment_screenshot":
-            # Check if this is a form submission
-            is_form = is_form_submission(incoming_text)
-            form_data = None
+        semaphore = asyncio.Semaphore(max_concurrency or settings.AGENT_BATCH_CONCURRENCY)
+        replies: List[Optional[str]] = [None] * len(items)
+        
+        by_session: Dict[str, List[int]] = {}
+        for index, (_, session_id, _) in enumerate(items):
+            by_session.setdefault(session_id, []).append(index)
+        
+        async def answer_session(indexes: List[int]) -> None:
+            async with semaphore:
+                for index in indexes:
+                    replies[index] = await self.get_response(*items[index])
+        
+        await asyncio.gather(*(answer_session(indexes) for indexes in by_session.values()))
+        return replies
+    
+    async def stream_response(
+        self,
+        incoming_text: str,
+        session_id: str,
+        whatsapp_message_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the agent's reply as text chunks while the model generates it.
+        
+        Same inputs and side effects as get_response(). Only answer text is
+        streamed: chunks of a model step that calls tools are dropped from
+        its first tool-call chunk on, so intermediate steps do not leak into
+        the reply.
+        
+        Args:
+            incoming_text: User message
+            session_id: Session ID
+            whatsapp_message_id: WhatsApp message ID (None for web chat)
             
-            if is_form:
-                form_data = parse_form_submission(incoming_text)
-                print(f"📝 Form submission detected: {form_data}")
+        Yields:
+            Non-empty text chunks in generation order
+        """
+        if is_greeting(incoming_text):
+            yield await self._answer_greeting(incoming_text, session_id, whatsapp_message_id)
+            return
+        
+        user_context, memory_context, persist_task = await self._start_turn(
+            incoming_text, session_id, whatsapp_message_id
+        )
+        
+        try:
+            inputs = self._build_turn(incoming_text, session_id, user_context, memory_context)
             
-            db.add(Message(
-                user_id=user_id,
-                sender="user",
-                content=incoming_text,
-                whatsapp_message_id=whatsapp_message_id,
-                timestamp=datetime.utcnow(),
-                form_data=form_data,
-                is_form_submission=is_form
-            ))
-            db.commit()
-
+            agent = self._select_agent(incoming_text, memory_context)
+            tool_calling_runs = set()
+            async for event in agent.astream_events(inputs, version="v2"):
+                if event["event"] != "on_chat_model_stream":
+                    continue
+                chunk = event["data"]["chunk"]
+                if getattr(chunk, "tool_call_chunks", None):
+                    tool_calling_runs.add(event["run_id"])
+                if event["run_id"] in tool_calling_runs:
+                    continue
+                if isinstance(chunk.content, str) and chunk.content:
+                    yield chunk.content
+        finally:
+            await _finish_persist(persist_task, session_id)
+    
+    async def _answer_greeting(self, incoming_text: str, session_id: str, whatsapp_message_id: Optional[str]) -> str:
+        """
+        Reply to a bare greeting without running the agent.
+        
+        The prompt's Greeting Detection section has the model answer every
+        greeting with send_booking_intro(), so the reply is known up front;
+        this skips the tool-call and final-answer model round-trips.
+        
+        Returns:
+            The booking intro message
+        """
+        user_context = await asyncio.to_thread(_load_user_context, session_id)
+        await asyncio.to_thread(
+            _persist_user_message,
+            user_context["user_id"],
+            incoming_text,
+            whatsapp_message_id
+        )
+        return _GREETING_REPLY
+    
+    async def _start_turn(self, incoming_text: str, session_id: str, whatsapp_message_id: Optional[str]):
+        """
+        Load user + memory for a turn and start saving the user message.
+        
+        Returns:
+            (user_context, memory_context, persist_task); the caller must
+            pass persist_task to _finish_persist() once the agent has run
+        """
         # ========================================
-        # 🧠 MEMORY PREPARATION (NEW)
+        # 🧠 LOAD USER + MEMORY
         # ========================================
-        from app.agents.memory import prepare_memory
-        
-        # Prepare optimal memory context
-        memory_context = prepare_memory(
-            session_id=session_id,
-            incoming_text=incoming_text,
-            db=db
+        # One worker thread, one DB session: the session row is shared by
+        # both loads instead of being fetched on two connections
+        user_context, memory_context = await asyncio.to_thread(
+            _load_turn_context, session_id, incoming_text
         )
         
-        print(f"🧠 Memory Context:")
-        print(f"  - Summary: {memory_context.summary[:100] if memory_context.summary else 'None'}...")
-        print(f"  - Recent messages: {len(memory_context.recent_messages)}")
-        print(f"  - Session state: {memory_context.session_state}")
+        # --- Save user message ---
+        # Runs alongside the agent call; prepare_memory() already appends the
+        # incoming text itself, so it must not see this row anyway
+        persist_task = None
+        if incoming_text != PAYMENT_SCREENSHOT_TRIGGER:
+            persist_task = asyncio.create_task(asyncio.to_thread(
+                _persist_user_message,
+                user_context["user_id"],
+                incoming_text,
+                whatsapp_message_id
+            ))
+        
+        return user_context, memory_context, persist_task
+    
+    def _build_turn(self, incoming_text: str, session_id: str, user_context: Dict, memory_context) -> Dict:
+        """
+        Build the agent input for a turn.
+        
+        Returns:
+            Dict with the conversation messages and the formatted session
+            context for the system prompt
+        """
+        logger.debug(
+            "🧠 Memory context: summary=%s recent_messages=%d session_state=%s",
+            bool(memory_context.summary),
+            len(memory_context.recent_messages),
+            memory_context.session_state
+        )
         
         # ========================================
         # Extract session context for prompt
         # ========================================
-        cnic = session.user.cnic if session and session.user else "None"
-        name = session.user.name if session and session.user else "None"
-        client_email = session.user.email if session and session.user else "unauthenticated"
+        cnic = user_context["cnic"] or "None"
+        name = user_context["name"] or "None"
+        client_email = user_context["email"] or "unauthenticated"
         property_type = memory_context.session_state.get('property_type') or "None"
         booking_date = memory_context.session_state.get('booking_date') or "None"
         shift_type = memory_context.session_state.get('shift_type') or "None"
@@ -413,35 +631,27 @@ class BookingToolAgent:
         max_price = memory_context.session_state.get('max_price') or "None"
         max_occupancy = memory_context.session_state.get('max_occupancy') or "None"
         
-        print(f"\n👤 User Context:")
-        print(f"  - Name: {name}")
-        print(f"  - CNIC: {cnic}")
-        print(f"  - Email: {client_email}")
-        
-        print(f"\nIncoming message: {incoming_text}")
+        logger.debug("👤 User context: name=%s email=%s", name, client_email)
         
         # ========================================
         # Format messages for agent
         # ========================================
-        messages = []
-        
-        # Add conversation summary as context (if exists)
-        if memory_context.summary:
-            messages.append(("system", f"📝 Conversation Summary: {memory_context.summary}"))
-        
-        # Add recent messages (last 4 only)
-        for msg in memory_context.recent_messages:
-            if msg["role"] == "user":
-                messages.append(("human", msg["content"]))
-            elif msg["role"] == "assistant":
-                messages.append(("assistant", msg["content"]))
+        # Built directly as message objects so nothing has to coerce
+        # (role, content) tuples on every model call. Every stored turn is
+        # kept: anything that isn't the user is the assistant's side.
+        messages = [
+            _MESSAGE_CLASSES.get(msg["role"], AIMessage)(content=msg["content"])
+            for msg in memory_context.recent_messages
+        ]
         
-        # Format the system prompt with session context
-        formatted_system_prompt = system_prompt.format(
+        # Only the session context is formatted; the static prefix is
+        # reused verbatim so the provider can serve it from its prompt cache
+        session_context = SESSION_CONTEXT_PROMPT.format(
             session_id=session_id,
             name=name,
             cnic=cnic if cnic else "None",
             date=date.today().isoformat(),
+            relevance="pre-checked" if is_obviously_relevant(incoming_text) else "not checked",
             property_type=property_type,
             booking_date=booking_date,
             shift_type=shift_type,
@@ -450,67 +660,64 @@ class BookingToolAgent:
             max_occupancy=max_occupancy
         )
         
-        # Create a temporary prompt with the formatted system message
-        temp_prompt = ChatPromptTemplate(
-            [
-                ("system", formatted_system_prompt),
-                MessagesPlaceholder(variable_name='messages'),
-            ]
-        )
+        if _takes_payment(incoming_text, memory_context):
+            session_context += PAYMENT_TOOLS_PROMPT
         
-        # Create a temporary agent with the formatted prompt (NO structured output)
-        temp_agent = create_react_agent(
-            model=self.llm,
-            tools=self.tools,
-            state_modifier=temp_prompt
-        )
-        
-        # Get regular response from agent
-        print("\n" + "="*80)
-        print("🔧 CALLING AGENT WITH TOOLS")
-        print("="*80)
-        print(f"Available tools: {[tool.name for tool in self.tools]}")
-        print(f"Message count: {len(messages)}")
-        print("="*80 + "\n")
+        # Conversation summary (if exists) rides in the same system message
+        if memory_context.summary:
+            session_context += f"\n📝 Conversation Summary: {memory_context.summary}\n"
         
-        response = temp_agent.invoke({
+        return {
             "messages": messages,
-        })
-        
-        # Log all messages in the response (including tool calls)
-        print("\n" + "="*80)
-        print("🔍 AGENT EXECUTION TRACE")
-        print("="*80)
-        for idx, msg in enumerate(response["messages"]):
-            msg_type = type(msg).__name__
-            print(f"\n[{idx}] Message Type: {msg_type}")
-            
-            if hasattr(msg, 'content'):
-                content_preview = str(msg.content)[:200] if msg.content else "None"
-                print(f"    Content: {content_preview}...")
-            
-            if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                print(f"    Tool Calls: {len(msg.tool_calls)}")
-                for tool_call in msg.tool_calls:
-                    print(f"      - Tool: {tool_call.get('name', 'unknown')}")
-                    print(f"        Args: {tool_call.get('args', {})}")
-            
-            if hasattr(msg, 'name'):
-                print(f"    Tool Name: {msg.name}")
-        print("="*80 + "\n")
+            "session_context": session_context
+        }
+    
+    async def _run_agent(self, incoming_text: str, session_id: str, user_context: Dict, memory_context) -> str:
+        inputs = self._build_turn(incoming_text, session_id, user_context, memory_context)
+        
+        logger.debug("🔧 Calling booking agent with %d messages", len(inputs["messages"]))
+        
+        agent = self._select_agent(incoming_text, memory_context)
+        response = await agent.ainvoke(inputs)
+        
+        # Trace every message in the run (including tool calls); skipped
+        # entirely unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, msg in enumerate(response["messages"]):
+                tool_calls = getattr(msg, "tool_calls", None) or []
+                logger.debug(
+                    "🔍 [%d] %s name=%s tool_calls=%s content=%.200s",
+                    idx,
+                    type(msg).__name__,
+                    getattr(msg, "name", None),
+                    [(call.get("name"), call.get("args")) for call in tool_calls],
+                    msg.content
+                )
         
         # Extract raw text response
         raw_response = response["messages"][-1].content
+        logger.debug("🤖 Booking agent response (%d chars)", len(str(raw_response)))
         
-        print("\n" + "="*80)
-        print("🤖 BOOKING AGENT - RAW OUTPUT")
-        print("="*80)
-        print(f"Response Type: {type(raw_response)}")
-        print(f"Response Length: {len(str(raw_response))} characters")
-        print(f"Response Content:")
-        print("-" * 80)
-        print(raw_response)
-        print("="*80 + "\n")
-        
-        db.close()
         return raw_response
+
+
+_booking_agent: Optional[BookingToolAgent] = None
+_booking_agent_lock = threading.Lock()
+
+
+def get_booking_agent() -> BookingToolAgent:
+    """
+    Get the shared booking agent, creating it on first use.
+    
+    The agent holds no per-conversation state, so every router reuses one
+    instance instead of rebuilding the LLM client, tool schemas and graph.
+    
+    Returns:
+        The process-wide BookingToolAgent
+    """
+    global _booking_agent
+    if _booking_agent is None:
+        with _booking_agent_lock:
+            if _booking_agent is None:
+                _booking_agent = BookingToolAgent()
+    return _booking_agent
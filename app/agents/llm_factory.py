@@ -11,7 +11,9 @@ Usage:
     embed_fn = get_embedding_function()
 """
 
+from functools import lru_cache
 from typing import Callable, List
+from langchain_core.caches import InMemoryCache
 from app.core.config import settings
 
 # Model configurations - centralized model names
@@ -21,13 +23,27 @@ OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
 GEMINI_CHAT_MODEL = "gemini-2.5-flash"
 GEMINI_EMBEDDING_MODEL = "models/embedding-001"
 
+# Responses for identical (messages, model, params) requests, used only by
+# chat models from get_llm(cached=True). Only exact repeats hit - e.g. the
+# formatter re-formatting the same reply. Tool-calling agents must not use
+# it: their answers depend on live data (availability, bookings) that an
+# identical history would replay stale.
+_RESPONSE_CACHE = InMemoryCache(maxsize=settings.LLM_CACHE_SIZE) if settings.LLM_CACHE_SIZE > 0 else None
 
-def get_llm(temperature: float = 0):
+
+def get_llm(temperature: float = 0, cached: bool = False):
     """
     Factory function to get LLM instance based on config.
     
+    Instances are cached per temperature, so every agent in the process
+    shares one client (and its pooled HTTP connections) instead of paying
+    TLS/channel setup for each new client.
+    
     Args:
         temperature: Temperature for generation (0 = deterministic, 1 = creative)
+        cached: Serve exact repeat requests from the in-memory response
+            cache (LLM_CACHE_SIZE); only for pure text transforms such as
+            the formatter, never for agents that call tools
         
     Returns:
         LangChain LLM instance (ChatOpenAI or ChatGoogleGenerativeAI)
@@ -35,14 +51,23 @@ def get_llm(temperature: float = 0):
     Raises:
         ValueError: If LLM_PROVIDER is not supported
     """
+    # Normalize so get_llm() and get_llm(temperature=0) share a cache entry
+    return _create_llm(float(temperature), cached)
+
+
+@lru_cache(maxsize=None)
+def _create_llm(temperature: float, cached: bool):
+    """Build the chat model for get_llm(); one instance per (temperature, cached)."""
     provider = settings.LLM_PROVIDER.lower()
+    cache = _RESPONSE_CACHE if cached else None
     
     if provider == "openai":
         from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model=OPENAI_CHAT_MODEL,
             temperature=temperature,
-            openai_api_key=settings.OPENAI_API_KEY
+            openai_api_key=settings.OPENAI_API_KEY,
+            cache=cache
         )
     
     elif provider == "gemini":
@@ -50,7 +75,8 @@ def get_llm(temperature: float = 0):
         return ChatGoogleGenerativeAI(
             model=GEMINI_CHAT_MODEL,
             temperature=temperature,
-            google_api_key=settings.GOOGLE_API_KEY
+            google_api_key=settings.GOOGLE_API_KEY,
+            cache=cache
         )
     
     else:
@@ -116,10 +142,14 @@ def get_embedding_function() -> Callable[[str], List[float]]:
         )
 
 
+@lru_cache(maxsize=None)
 def get_llm_for_summary(temperature: float = 0):
     """
     Get LLM specifically for summary generation.
     
+    Cached like get_llm(), so summarization reuses one client instead of
+    opening a new connection pool per summary.
+    
     This is a separate function in case we want different models
     for summarization vs. agent conversations in the future.
     
@@ -13,14 +13,16 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 from sqlalchemy.orm import Session as DBSession
-from sqlalchemy import desc
 
 from app.database import SessionLocal
-from app.models import Session, Message
+from app.models import Session
+from app.repositories.message_repository import MessageRepository
 from app.repositories.session_repository import SessionRepository
 from app.agents.memory.summarizer import generate_summary
 from app.agents.memory.state_detector import should_summarize
 
+_message_repo = MessageRepository()
+
 
 @dataclass
 class MemoryContext:
@@ -70,13 +72,15 @@ def prepare_memory(
     
     try:
         # STEP 1: Load existing memory
-        session_repo = SessionRepository()
-        session = session_repo.get_by_id(db, session_id)
+        # Primary-key get: served from the identity map when the caller has
+        # already loaded this session on the same db
+        session = db.get(Session, session_id)
         
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
-        user_id = session.user.user_id
+        # Read the FK directly instead of lazy-loading the User row
+        user_id = session.user_id
         
         # Load existing summary
         existing_summary = session.conversation_summary
@@ -147,22 +151,15 @@ def _load_recent_messages(db: DBSession, user_id: str, limit: int = 6) -> List[D
     Returns:
         List of message dicts with role and content
     """
-    messages = (
-        db.query(Message)
-        .filter(Message.user_id == user_id)
-        .order_by(desc(Message.timestamp))
-        .limit(limit)
-        .all()
-    )
+    rows = _message_repo.get_recent_turns(db, user_id, limit)
     
-    # Reverse to get chronological order (oldest first)
-    formatted = []
-    for msg in reversed(messages):
-        role = "user" if msg.sender == "user" else "assistant"
-        formatted.append({
-            "role": role,
-            "content": msg.content
-        })
+    formatted = [
+        {
+            "role": "user" if sender == "user" else "assistant",
+            "content": content
+        }
+        for sender, content in rows
+    ]
     
     return formatted
 
@@ -0,0 +1,136 @@
+"""
+Tool execution node for the agents.
+
+LangGraph's default ToolNode runs every tool call from one model step at
+the same time. Most of our tools are read-only lookups that benefit from
+that, but several write to the session or booking rows and must not race
+each other (e.g. set_booking_preferences + list_properties in one step).
+
+BookingToolNode runs consecutive read-only calls concurrently (bounded by
+TOOL_CONCURRENCY_LIMIT) and runs every other call on its own, in the order
+the model emitted them. ToolMessages are returned in tool_call order, as
+the function-calling protocol requires.
+
+On the async path (ainvoke/astream_events, which both agents use) each
+call is bounded by TOOL_TIMEOUT_SECONDS. A call that runs over is answered
+with an error ToolMessage so the model can tell the user, instead of
+holding the whole turn open.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import get_config_list, get_executor_for_config
+from langgraph.prebuilt import ToolNode
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A timed-out tool keeps running in its worker thread and may still commit,
+# so the model must not assume it failed
+TOOL_TIMEOUT_MESSAGE = (
+    "⏳ {tool} is taking longer than expected and may still complete in the "
+    "background. Check the current status before retrying."
+)
+
+# Tools that only read data and can safely run side by side.
+# Anything not listed here is treated as state-changing and runs alone.
+READ_ONLY_TOOLS = frozenset({
+    "get_property_pricing",
+    "get_property_details",
+    "get_property_images",
+    "get_property_videos",
+    "get_property_media",
+    "check_booking_status",
+    "get_user_bookings",
+    "get_payment_instructions",
+    "check_message_relevance",
+    "check_booking_date",
+})
+
+
+def _group_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Split tool calls into groups that may run concurrently.
+    
+    Consecutive read-only calls share a group; every other call gets a
+    group of its own, which acts as a barrier between the reads around it.
+    
+    Args:
+        tool_calls: Tool calls from the model, in emitted order
+        
+    Returns:
+        List of groups, each a list of indexes into tool_calls
+    """
+    groups: List[List[int]] = []
+    for index, call in enumerate(tool_calls):
+        if call["name"] in READ_ONLY_TOOLS and groups and tool_calls[groups[-1][0]]["name"] in READ_ONLY_TOOLS:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+    return groups
+
+
+class BookingToolNode(ToolNode):
+    """ToolNode that only parallelizes read-only tools."""
+    
+    def __init__(
+        self,
+        tools,
+        *,
+        concurrency_limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ):
+        super().__init__(tools, **kwargs)
+        self.concurrency_limit = max(1, concurrency_limit or settings.TOOL_CONCURRENCY_LIMIT)
+        self.timeout = settings.TOOL_TIMEOUT_SECONDS if timeout is None else timeout
+    
+    def _func(self, input, config: RunnableConfig, *, store) -> Any:
+        tool_calls, output_type = self._parse_input(input, store)
+        config_list = get_config_list(config, len(tool_calls))
+        outputs: List[Optional[ToolMessage]] = [None] * len(tool_calls)
+        
+        def run(index: int) -> ToolMessage:
+            return self._run_one(tool_calls[index], config_list[index])
+        
+        with get_executor_for_config({**config, "max_concurrency": self.concurrency_limit}) as executor:
+            for group in _group_tool_calls(tool_calls):
+                for index, message in zip(group, executor.map(run, group)):
+                    outputs[index] = message
+        
+        return outputs if output_type == "list" else {self.messages_key: outputs}
+    
+    async def _afunc(self, input, config: RunnableConfig, *, store) -> Any:
+        tool_calls, output_type = self._parse_input(input, store)
+        outputs: List[Optional[ToolMessage]] = [None] * len(tool_calls)
+        semaphore = asyncio.Semaphore(self.concurrency_limit)
+        
+        async def run(index: int) -> None:
+            async with semaphore:
+                outputs[index] = await self._arun_with_timeout(tool_calls[index], config)
+        
+        for group in _group_tool_calls(tool_calls):
+            await asyncio.gather(*(run(index) for index in group))
+        
+        return outputs if output_type == "list" else {self.messages_key: outputs}
+    
+    async def _arun_with_timeout(self, call: Dict[str, Any], config: RunnableConfig) -> ToolMessage:
+        if not self.timeout:
+            return await self._arun_one(call, config)
+        
+        try:
+            return await asyncio.wait_for(self._arun_one(call, config), self.timeout)
+        except asyncio.TimeoutError:
+            # Args are not logged: several tools take CNIC/phone numbers
+            logger.warning("⏱️ Tool %s timed out after %ss (call %s)", call["name"], self.timeout, call["id"])
+            return ToolMessage(
+                content=TOOL_TIMEOUT_MESSAGE.format(tool=call["name"]),
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error"
+            )
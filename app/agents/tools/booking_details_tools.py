@@ -11,7 +11,6 @@ from typing import Optional
 
 from app.database import SessionLocal
 from app.repositories.session_repository import SessionRepository
-from app.repositories.user_repository import UserRepository
 from app.core.constants import CNIC_LENGTH
 
 logger = logging.getLogger(__name__)
@@ -71,14 +70,10 @@ def prepare_booking_details(
     """
     db = SessionLocal()
     try:
-        print("\n" + "="*80)
-        print("🔧 PREPARE_BOOKING_DETAILS TOOL CALLED")
-        print("="*80)
-        print(f"Session ID: {session_id}")
-        print(f"User Name provided: {user_name}")
-        print(f"CNIC provided: {cnic}")
-        print(f"Action: {action}")
-        print("="*80 + "\n")
+        logger.debug(
+            "prepare_booking_details called: session=%s name=%s cnic=%s action=%s",
+            session_id, bool(user_name), bool(cnic), action
+        )
         
         # Get session and user
         session_repo = SessionRepository()
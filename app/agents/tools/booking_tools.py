@@ -12,7 +12,7 @@ These tools use the BookingService layer for all business logic.
 
 import logging
 from langchain.tools import tool
-from typing import Dict, Optional
+from typing import Optional
 from datetime import datetime
 
 from app.database import SessionLocal
@@ -53,15 +53,10 @@ def create_booking(
     """
     db = SessionLocal()
     try:
-        print("\n" + "="*80)
-        print("🔧 CREATE_BOOKING TOOL CALLED")
-        print("="*80)
-        print(f"Session ID: {session_id}")
-        print(f"Booking Date: {booking_date}")
-        print(f"Shift Type: {shift_type}")
-        print(f"CNIC provided: {bool(cnic)}")
-        print(f"User Name provided: {bool(user_name)}")
-        print("="*80 + "\n")
+        logger.debug(
+            "create_booking called: session=%s date=%s shift=%s cnic=%s name=%s",
+            session_id, booking_date, shift_type, bool(cnic), bool(user_name)
+        )
         
         # Get session to find user and property
         session_repo = SessionRepository()
@@ -103,19 +98,10 @@ def create_booking(
         
         # Return message or error
         if result.get("success"):
-            print("\n" + "="*80)
-            print("✅ CREATE_BOOKING TOOL - SUCCESS")
-            print("="*80)
-            print(f"Booking ID: {result.get('booking_id')}")
-            print(f"Message length: {len(result.get('message', ''))}")
-            print("="*80 + "\n")
+            logger.debug("create_booking succeeded: booking_id=%s", result.get("booking_id"))
             return {"message": result["message"]}
         else:
-            print("\n" + "="*80)
-            print("❌ CREATE_BOOKING TOOL - ERROR")
-            print("="*80)
-            print(f"Error: {result.get('error')}")
-            print("="*80 + "\n")
+            logger.warning("create_booking failed: %s", result.get("error"))
             # All errors from service are actual errors (availability, validation, missing data, etc.)
             return {"error": result.get("error", "Failed to create booking")}
         
@@ -144,26 +130,15 @@ def check_booking_status(booking_id: str) -> dict:
     """
     db = SessionLocal()
     try:
-        print("\n" + "="*80)
-        print("🔧 CHECK_BOOKING_STATUS TOOL CALLED")
-        print("="*80)
-        print(f"Booking ID (raw): '{booking_id}'")
-        print("="*80 + "\n")
-        
         booking_id = booking_id.strip()
-        
-        print(f"Booking ID (stripped): '{booking_id}'")
+        logger.debug("check_booking_status called: booking_id=%r", booking_id)
         
         # Check booking status using service
         booking_service = BookingService()
         result = booking_service.check_booking_status(db, booking_id)
         
         if not result.get("success"):
-            print("\n" + "="*80)
-            print("❌ CHECK_BOOKING_STATUS - NOT FOUND")
-            print("="*80)
-            print(f"Error: {result.get('error')}")
-            print("="*80 + "\n")
+            logger.warning("check_booking_status failed: %s", result.get("error"))
             return {"error": result.get("error", "Booking not found. Please check your booking ID.")}
         
         booking = result["booking"]
@@ -313,13 +288,8 @@ def get_payment_instructions(booking_id: str) -> dict:
     """
     db = SessionLocal()
     try:
-        print("\n" + "="*80)
-        print("🔧 GET_PAYMENT_INSTRUCTIONS TOOL CALLED")
-        print("="*80)
-        print(f"Booking ID (raw): '{booking_id}'")
-        print("="*80 + "\n")
-        
         booking_id = booking_id.strip()
+        logger.debug("get_payment_instructions called: booking_id=%r", booking_id)
         
         # Check booking status using service
         booking_service = BookingService()
@@ -11,8 +11,7 @@ All tools delegate business logic to PaymentService.
 """
 
 from langchain.tools import tool
-from typing import Dict, Optional
-from sqlalchemy.orm import Session
+from typing import Optional
 
 from app.database import SessionLocal
 from app.services.payment_service import PaymentService
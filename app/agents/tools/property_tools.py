@@ -12,11 +12,16 @@ These tools use the PropertyService and SessionService layers for all business l
 """
 
 import logging
+import threading
+import time
 from langchain.tools import tool
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 from difflib import SequenceMatcher
 
+from sqlalchemy import text
+
+from app.core.config import settings
 from app.database import SessionLocal
 from app.services.property_service import PropertyService
 from app.services.session_service import SessionService
@@ -26,6 +31,88 @@ from app.repositories.session_repository import SessionRepository
 
 logger = logging.getLogger(__name__)
 
+# Candidate names for get_property_id_from_name, statements built once at import
+_PROPERTY_NAMES_BY_TYPE_SQL = text("""
+    SELECT property_id, name, city, type
+    FROM properties
+    WHERE type = :property_type
+""")
+
+_ALL_PROPERTY_NAMES_SQL = text("""
+    SELECT property_id, name, city, type
+    FROM properties
+""")
+
+# property_type (None = all types) -> (loaded_at, candidate names).
+# The catalog changes rarely, while name lookups repeat on every turn
+# that mentions a property.
+_property_names_cache: Dict[Optional[str], Tuple[float, List[Dict]]] = {}
+_property_names_lock = threading.Lock()
+
+
+def _load_property_names(db, property_type: Optional[str]) -> List[Dict]:
+    """
+    Load name-matching candidates, served from a short-lived cache.
+    
+    Args:
+        db: Database session
+        property_type: Restrict to this type, or None for all properties
+        
+    Returns:
+        List of dicts with property_id, name, city and type
+    """
+    ttl = settings.PROPERTY_CATALOG_TTL
+    if ttl <= 0:
+        return _query_property_names(db, property_type)
+    
+    cached = _property_names_cache.get(property_type)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    # Tools run in worker threads; when the entry is missing or stale, the
+    # first caller reloads it and concurrent callers wait for that result
+    # instead of issuing the same query themselves
+    with _property_names_lock:
+        cached = _property_names_cache.get(property_type)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        
+        property_names = _query_property_names(db, property_type)
+        _property_names_cache[property_type] = (time.monotonic(), property_names)
+        return property_names
+
+
+def _query_property_names(db, property_type: Optional[str]) -> List[Dict]:
+    """
+    Query name-matching candidates from the database.
+    
+    Args:
+        db: Database session
+        property_type: Restrict to this type, or None for all properties
+        
+    Returns:
+        List of dicts with property_id, name, city and type
+    """
+    if property_type:
+        results = db.execute(_PROPERTY_NAMES_BY_TYPE_SQL, {"property_type": property_type}).fetchall()
+    else:
+        results = db.execute(_ALL_PROPERTY_NAMES_SQL).fetchall()
+    
+    return [
+        {
+            'property_id': str(row[0]),
+            'name': row[1],
+            'city': row[2],
+            'type': row[3]
+        }
+        for row in results
+    ]
+
+
+def _numbered_urls(urls: List[str]) -> str:
+    """Format media URLs as a numbered list, one "N. url" line each."""
+    return "".join(f"{i}. {url}\n" for i, url in enumerate(urls, 1))
+
 
 @tool("list_properties")
 def list_properties(
@@ -201,7 +288,7 @@ def get_property_pricing(session_id: str) -> str:
         
         # Format ONLY pricing info
         if prop.get("pricing"):
-            pricing_text = f"*Pricing for {prop['name']}:*\n\n"
+            pricing_lines = [f"*Pricing for {prop['name']}:*\n\n"]
             current_day = None
             for pricing in prop["pricing"]:
                 day_of_week = pricing["day_of_week"]
@@ -209,11 +296,11 @@ def get_property_pricing(session_id: str) -> str:
                 price = pricing["price"]
                 
                 if current_day != day_of_week:
-                    pricing_text += f"\n*{day_of_week.capitalize()}:*\n"
+                    pricing_lines.append(f"\n*{day_of_week.capitalize()}:*\n")
                     current_day = day_of_week
-                pricing_text += f"  • {shift_type}: Rs.{int(price)}/-\n"
+                pricing_lines.append(f"  • {shift_type}: Rs.{int(price)}/-\n")
             
-            return pricing_text
+            return "".join(pricing_lines)
         else:
             return f"Pricing information not available for {prop['name']}. Please contact us for rates."
         
@@ -351,15 +438,10 @@ def get_property_media(session_id: str) -> str:
         response = f"Here are the images and videos of {property_name}:\n\n"
         
         if images:
-            response += "Images:\n"
-            for i, img_url in enumerate(images, 1):
-                response += f"{i}. {img_url}\n"
-            response += "\n"
+            response += "Images:\n" + _numbered_urls(images) + "\n"
         
         if videos:
-            response += "Videos:\n"
-            for i, video_url in enumerate(videos, 1):
-                response += f"{i}. {video_url}\n"
+            response += "Videos:\n" + _numbered_urls(videos)
         
         return response
         
@@ -424,11 +506,7 @@ def get_property_images(session_id: str) -> str:
         property_name = result.get("name", "this property") if "error" not in result else "this property"
         
         # Format response with descriptive text and URLs
-        response = f"Here are the images for {property_name}:\n\n"
-        for i, img_url in enumerate(images, 1):
-            response += f"{i}. {img_url}\n"
-        
-        return response
+        return f"Here are the images for {property_name}:\n\n" + _numbered_urls(images)
         
     except Exception as e:
         logger.error(f"Error in get_property_images tool: {e}", exc_info=True)
@@ -491,11 +569,7 @@ def get_property_videos(session_id: str) -> str:
         property_name = result.get("name", "this property") if "error" not in result else "this property"
         
         # Format response with descriptive text and URLs
-        response = f"Here are the videos for {property_name}:\n\n"
-        for i, video_url in enumerate(videos, 1):
-            response += f"{i}. {video_url}\n"
-        
-        return response
+        return f"Here are the videos for {property_name}:\n\n" + _numbered_urls(videos)
         
     except Exception as e:
         logger.error(f"Error in get_property_videos tool: {e}", exc_info=True)
@@ -720,36 +794,7 @@ def get_property_id_from_name(session_id: str, property_name: str) -> str:
         property_type = session.property_type if session.property_type else None
         
         # Get all property names based on type
-        property_repo = PropertyRepository()
-        
-        if property_type:
-            # Query properties of specific type
-            sql = """
-                SELECT property_id, name, city, type
-                FROM properties
-                WHERE type = :property_type
-            """
-            from sqlalchemy import text
-            results = db.execute(text(sql), {"property_type": property_type}).fetchall()
-        else:
-            # Query all properties
-            sql = """
-                SELECT property_id, name, city, type
-                FROM properties
-            """
-            from sqlalchemy import text
-            results = db.execute(text(sql)).fetchall()
-        
-        # Convert to list of dicts
-        property_names = [
-            {
-                'property_id': str(row[0]),
-                'name': row[1],
-                'city': row[2],
-                'type': row[3]
-            }
-            for row in results
-        ]
+        property_names = _load_property_names(db, property_type)
         
         if not property_names:
             return f"❌ No properties found{' of type ' + property_type if property_type else ''}."
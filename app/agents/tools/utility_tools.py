@@ -2,9 +2,56 @@
 Utility tools for the booking agent
 """
 from langchain.tools import tool
-from typing import Dict, Optional
 from datetime import datetime
 import calendar
+import re
+
+# Words/numbers that make a message obviously about bookings. Used to skip
+# the check_message_relevance tool round-trip for the common case.
+_OBVIOUSLY_RELEVANT_RE = re.compile(
+    r"\b(?:huts?|farms?|farmhouses?|book(?:ing|ings|ed)?|reserve|rent|propert(?:y|ies)"
+    r"|available|availability|price|prices|cost|date|shift|day|night|guests?|people"
+    r"|pay|payment|cnic|salam|assalam|hello|hi)\b"
+    r"|\d",
+    re.IGNORECASE
+)
+
+
+def is_obviously_relevant(user_message: str) -> bool:
+    """
+    Cheap pre-check for booking-related messages.
+    
+    Args:
+        user_message: Raw user message
+        
+    Returns:
+        True if the message clearly relates to bookings (keywords, greetings,
+        or any digit such as a date, price or guest count)
+    """
+    return bool(_OBVIOUSLY_RELEVANT_RE.search(user_message))
+
+
+# A message that is nothing but a greeting (plus punctuation)
+_GREETING_ONLY_RE = re.compile(
+    r"^\s*(?:hi+|hello+|hey+|salam|salaam|aoa"
+    r"|a?ss?alam(?:u|o)?\s*(?:o\s*)?(?:alaikum|alaykum|alykum|alekum))"
+    r"(?:\s+(?:there|bot|hutbuddy))?[\s!.,?]*$",
+    re.IGNORECASE
+)
+
+
+def is_greeting(user_message: str) -> bool:
+    """
+    Check whether a message is only a greeting.
+    
+    Args:
+        user_message: Raw user message
+        
+    Returns:
+        True for bare greetings such as "hi", "Salam!" or "assalam o alaikum";
+        False if the message carries anything else
+    """
+    return bool(_GREETING_ONLY_RE.match(user_message))
 
 
 @tool("check_message_relevance")
@@ -53,19 +100,9 @@ def check_message_relevance(user_message: str) -> dict:
         "redirect_message": None
     }
 
-@tool("send_booking_intro")
-def send_booking_intro() -> str:
-    """
-    CALL: greeting new user or explaining booking process
-    NO CALL: specific booking queries, media requests
-
-    REQ: none
-
-    RETURNS:
-    ok {formatted WhatsApp intro message}
-    """
 
-    message = """
+# Returned by send_booking_intro and used directly for bare greetings
+BOOKING_INTRO_MESSAGE = """
     Hello! I’m HutBuddy AI, your booking assistant.
 
     I can help you with:
@@ -86,7 +123,21 @@ def send_booking_intro() -> str:
        ‣ *Price Range* (optional)
 
     """
-    return message
+
+
+@tool("send_booking_intro")
+def send_booking_intro() -> str:
+    """
+    CALL: greeting new user or explaining booking process
+    NO CALL: specific booking queries, media requests
+
+    REQ: none
+
+    RETURNS:
+    ok {formatted WhatsApp intro message}
+    """
+
+    return BOOKING_INTRO_MESSAGE
 
 @tool("check_booking_date")
 def check_booking_date(day: int, month: int = None, year: int = None) -> dict:
@@ -345,7 +345,7 @@ async def send_admin_message(
         
         # Call admin agent to process the command
         admin_agent = get_admin_agent()
-        agent_response = admin_agent.get_response(incoming_text, session_id)
+        agent_response = await admin_agent.get_response(incoming_text, session_id)
         print(f"🤖 Admin agent response: {agent_response}")
         
         # Extract booking ID from response
@@ -14,23 +14,13 @@ import uuid
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User, Session as SessionModel, Message
-from app.agents.booking_agent import BookingToolAgent
+from app.agents.booking_agent import get_booking_agent
 from app.repositories.user_repository import UserRepository
 from app.repositories.session_repository import SessionRepository
 from app.repositories.message_repository import MessageRepository
 
 router = APIRouter(prefix="/demo", tags=["Demo/Test"])
 
-# Lazy initialization
-_booking_agent = None
-
-def get_booking_agent():
-    """Get or create the booking agent instance."""
-    global _booking_agent
-    if _booking_agent is None:
-        _booking_agent = BookingToolAgent()
-    return _booking_agent
-
 # ==================== Request/Response Models ====================
 
 class CreateUserRequest(BaseModel):
@@ -189,7 +179,7 @@ async def send_chat_message(
         
         # Get bot response
         agent = get_booking_agent()
-        bot_response_text = agent.get_response(
+        bot_response_text = await agent.get_response(
             incoming_text=request.message,
             session_id=session.id,
             whatsapp_message_id=None
@@ -5,14 +5,18 @@ This module provides HTTP endpoints for web-based chat functionality including
 message sending, image uploads, chat history, and session management.
 """
 
+import asyncio
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.api.dependencies import (
     get_session_service,
     get_message_repository,
@@ -27,7 +31,7 @@ from app.services.media_service import MediaService
 from app.repositories.message_repository import MessageRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.session_repository import SessionRepository
-from app.agents.booking_agent import BookingToolAgent
+from app.agents.booking_agent import get_booking_agent
 from app.agents.admin_agent import AdminAgent
 from app.core.response_formatter import ResponseFormatterAgent
 from app.core.constants import WEB_ADMIN_USER_ID
@@ -51,19 +55,15 @@ from app.models.booking import Booking
 
 
 router = APIRouter(prefix="/web-chat", tags=["web-chat"])
+logger = logging.getLogger(__name__)
+
+# Closes a streamed reply that failed part-way (the HTTP status is already sent)
+STREAM_ERROR_MESSAGE = "Something went wrong while answering. Please try again."
 
 # Lazy initialization - agents will be created when first needed
-_booking_agent = None
 _admin_agent = None
 _formatter_agent = None
 
-def get_booking_agent():
-    """Get or create the booking agent instance."""
-    global _booking_agent
-    if _booking_agent is None:
-        _booking_agent = BookingToolAgent()
-    return _booking_agent
-
 def get_admin_agent():
     """Get or create the admin agent instance."""
     global _admin_agent
@@ -98,6 +98,8 @@ class ChatHistoryRequest(BaseModel):
     """Request model for chat history retrieval."""
     user_id: str
     limit: Optional[int] = 50
+    before: Optional[datetime] = None  # timestamp of the oldest message already shown
+    before_id: Optional[int] = None  # message_id of that message (breaks timestamp ties)
 
 
 # ==================== Response Models ====================
@@ -193,7 +195,7 @@ async def handle_admin_message(
         
         # Call admin agent to process the command
         admin_agent = get_admin_agent()
-        agent_response = admin_agent.get_response(incoming_text, admin_session.id)
+        agent_response = await admin_agent.get_response(incoming_text, admin_session.id)
         
         # Extract booking ID from response if present
         import re
@@ -431,29 +433,25 @@ async def send_web_message(
         
         # Get bot response (raw text)
         booking_agent = get_booking_agent()
-        raw_response = booking_agent.get_response(
+        raw_response = await booking_agent.get_response(
             incoming_text=incoming_text,
             session_id=session_id,
             whatsapp_message_id=None  # Not applicable for web
         )
         
-        print("\n" + "="*80)
-        print("🌐 WEB CHAT API - RECEIVED FROM BOOKING AGENT")
-        print("="*80)
-        print(f"User Message: {incoming_text}")
-        print(f"Raw Response Length: {len(raw_response)} characters")
-        print("="*80 + "\n")
+        logger.debug(
+            "🌐 Booking agent replied (%d chars) to: %s",
+            len(raw_response), incoming_text
+        )
         
         # Format response using separate formatter agent
         formatter_agent = get_formatter_agent()
         structured_response = formatter_agent.format_response(raw_response)
         
-        print("\n" + "="*80)
-        print("🌐 WEB CHAT API - RECEIVED FROM FORMATTER AGENT")
-        print("="*80)
-        print(f"Structured Response Status: {structured_response.get('status')}")
-        print(f"Response Count: {structured_response.get('response_count')}")
-        print("="*80 + "\n")
+        logger.debug(
+            "🌐 Formatter returned status=%s responses=%s",
+            structured_response.get("status"), structured_response.get("response_count")
+        )
         
         # Extract main message for saving to database (combine all main messages)
         main_messages = []
@@ -487,15 +485,15 @@ async def send_web_message(
         bot_message.structured_response = structured_response.get("responses")
         db.commit()
         
-        print("\n" + "="*80)
-        print("📤 WEB CHAT API - SENDING TO FRONTEND")
-        print("="*80)
-        print(f"Status: {structured_response.get('status', 'success')}")
-        print(f"Response Count: {structured_response.get('response_count')}")
-        print(f"Message ID: {bot_message.id}")
-        print(f"Combined Message Length: {len(combined_message)} characters")
-        print(f"Media URLs: Images={len(all_media_urls.get('images', []))}, Videos={len(all_media_urls.get('videos', []))}")
-        print("="*80 + "\n")
+        logger.debug(
+            "📤 Sending message %s to frontend: status=%s responses=%s chars=%d images=%d videos=%d",
+            bot_message.id,
+            structured_response.get("status", "success"),
+            structured_response.get("response_count"),
+            len(combined_message),
+            len(all_media_urls.get("images", [])),
+            len(all_media_urls.get("videos", []))
+        )
         
         # Return structured response
         return ChatResponse(
@@ -532,6 +530,92 @@ async def send_web_message(
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
 
+@router.post("/send-message/stream")
+async def stream_web_message(
+    message_data: WebChatMessage,
+    db: Session = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
+    session_service: SessionService = Depends(get_session_service),
+    message_repo: MessageRepository = Depends(get_message_repository)
+):
+    """
+    Stream the booking agent's reply to web chat as plain text chunks.
+    
+    Text is flushed as the model generates it instead of after the full
+    completion, so the first words reach the frontend at first-token
+    latency. The reply is not run through the formatter agent; it is
+    saved as a bot message once the stream ends. If the agent fails
+    mid-stream the error is logged and the reply ends with a fallback
+    message. Admin commands are not streamed and must use /send-message.
+    
+    Args:
+        message_data: Message content and user ID
+        db: Database session
+        user_repo: User repository
+        session_service: Session service
+        message_repo: Message repository
+        
+    Returns:
+        StreamingResponse of text/plain chunks
+    """
+    user_id = validate_and_get_user_id(message_data.user_id, user_repo, db)
+    incoming_text = message_data.message
+    
+    admin_uuid = WEB_ADMIN_USER_ID if isinstance(WEB_ADMIN_USER_ID, UUID) else UUID(WEB_ADMIN_USER_ID)
+    if user_id == admin_uuid:
+        raise HTTPException(status_code=400, detail="Admin commands must use /send-message")
+    
+    session_result = session_service.get_or_create_session(
+        db=db,
+        user_id=user_id,
+        session_id=str(user_id),
+        source="Website"
+    )
+    if not session_result["success"]:
+        raise HTTPException(
+            status_code=400,
+            detail=session_result.get("message", "Failed to create session")
+        )
+    
+    session_id = session_result["session_id"]
+    booking_agent = get_booking_agent()
+    
+    def save_reply(content: str) -> None:
+        # The request's db session is closed once the response starts
+        # streaming, so the reply is saved with a session of its own
+        with SessionLocal() as reply_db:
+            message_repo.save_message(
+                db=reply_db,
+                user_id=user_id,
+                sender="bot",
+                content=content,
+                whatsapp_message_id=None
+            )
+    
+    async def reply_chunks():
+        chunks = []
+        try:
+            async for chunk in booking_agent.stream_response(
+                incoming_text=incoming_text,
+                session_id=session_id,
+                whatsapp_message_id=None  # Not applicable for web
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            # Headers are already sent, so the error can't become a 500;
+            # close the reply with a fallback and save that instead
+            logger.exception("Streaming web chat reply failed for session %s", session_id)
+            fallback = STREAM_ERROR_MESSAGE if not chunks else "\n\n" + STREAM_ERROR_MESSAGE
+            chunks.append(fallback)
+            yield fallback
+        
+        if chunks:
+            await asyncio.to_thread(save_reply, "".join(chunks))
+    
+    return StreamingResponse(reply_chunks(), media_type="text/plain")
+
+
 @router.post("/send-image", response_model=ChatResponse)
 async def send_web_image(
     image_data: WebImageMessage,
@@ -727,7 +811,7 @@ async def get_chat_history(
     Get chat history for a user.
     
     Args:
-        history_request: User ID and limit
+        history_request: User ID, limit and optional `before`/`before_id` cursor
         db: Database session
         user_repo: User repository
         message_repo: Message repository
@@ -747,7 +831,9 @@ async def get_chat_history(
             db=db,
             user_id=user_id_uuid,
             limit=limit,
-            oldest_first=True
+            oldest_first=True,
+            before=history_request.before,
+            before_id=history_request.before_id
         )
         
         # Format response with form submission handling
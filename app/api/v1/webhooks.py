@@ -7,7 +7,7 @@ delegating business logic to the service layer.
 
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import PlainTextResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
@@ -33,7 +33,7 @@ from app.repositories.session_repository import SessionRepository
 from app.repositories.message_repository import MessageRepository
 from app.integrations.whatsapp import WhatsAppClient
 from app.integrations.cloudinary import CloudinaryClient
-from app.agents.booking_agent import BookingToolAgent
+from app.agents.booking_agent import get_booking_agent
 from app.agents.admin_agent import AdminAgent
 from app.core.config import settings
 from app.core.constants import VERIFICATION_WHATSAPP
@@ -51,16 +51,8 @@ from app.models import Session as SessionModel, Message, User
 router = APIRouter()
 
 # Lazy initialization - agents will be created when first needed
-_agent = None
 _admin_agent = None
 
-def get_agent():
-    """Get or create the booking agent instance."""
-    global _agent
-    if _agent is None:
-        _agent = BookingToolAgent()
-    return _agent
-
 def get_admin_agent():
     """Get or create the admin agent instance."""
     global _admin_agent
@@ -341,8 +333,8 @@ async def _handle_image_message(
         booking_repo.update_payment_screenshot_url(db, booking_id, image_url)
         
         # Process payment screenshot using agent (will be refactored in Phase 8)
-        agent = get_agent()
-        payment_details = agent.get_response(
+        agent = get_booking_agent()
+        payment_details = await agent.get_response(
             incoming_text="Image received run process_payment_screenshot",
             session_id=session_id,
             whatsapp_message_id=user_whatsapp_msg_id
@@ -414,8 +406,8 @@ async def _handle_text_message(
         print(f"💬 Received text message: {text}")
         
         # Get bot response using agent (will be refactored in Phase 8)
-        agent = get_agent()
-        agent_response = agent.get_response(
+        agent = get_booking_agent()
+        agent_response = await agent.get_response(
             incoming_text=text,
             session_id=session_id,
             whatsapp_message_id=user_whatsapp_msg_id
@@ -512,10 +504,15 @@ async def _handle_admin_message(
         
         # Get admin response using admin agent (will be refactored in Phase 8)
         admin_agent = get_admin_agent()
-        admin_bot_answer = admin_agent.get_response(text, session_id)
+        admin_bot_answer = await admin_agent.get_response(text, session_id)
         
         # Get customer information from session
-        session = db.query(SessionModel).filter_by(id=session_id).first()
+        session = (
+            db.query(SessionModel)
+            .options(joinedload(SessionModel.user))
+            .filter_by(id=session_id)
+            .first()
+        )
         if not session or not session.user:
             print(f"❌ Session or user not found")
             raise BookingException("Session or user not found", "SESSION_NOT_FOUND")
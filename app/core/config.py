@@ -6,7 +6,6 @@ Centralizes all environment variables and provides type-safe configuration acces
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator
 from typing import Optional
-import os
 
 
 class Settings(BaseSettings):
@@ -21,6 +20,16 @@ class Settings(BaseSettings):
         description="PostgreSQL database connection URL"
     )
     
+    DB_POOL_SIZE: int = Field(
+        default=20,
+        description="Database connections kept open in the pool"
+    )
+    
+    DB_MAX_OVERFLOW: int = Field(
+        default=10,
+        description="Extra database connections allowed when the pool is exhausted"
+    )
+    
     # LLM Provider Configuration
     LLM_PROVIDER: str = Field(
         default="openai",
@@ -39,6 +48,37 @@ class Settings(BaseSettings):
         description="Google Generative AI API key for Gemini models (required if LLM_PROVIDER=gemini, also used for payment screenshot analysis)"
     )
     
+    # Agent Tool Execution
+    TOOL_CONCURRENCY_LIMIT: int = Field(
+        default=4,
+        description="Maximum read-only tool calls the agent runs in parallel within one step"
+    )
+    
+    TOOL_TIMEOUT_SECONDS: float = Field(
+        default=30,
+        description="Seconds an agent waits for one tool call before answering with a timeout message (0 waits indefinitely)"
+    )
+    
+    AGENT_BATCH_CONCURRENCY: int = Field(
+        default=10,
+        description="Maximum sessions get_response_batch() runs concurrently"
+    )
+    
+    LLM_CACHE_SIZE: int = Field(
+        default=1024,
+        description="Max identical-prompt formatter responses kept in memory per process (0 disables the cache)"
+    )
+    
+    PROPERTY_CATALOG_TTL: int = Field(
+        default=300,
+        description="Seconds the property name catalog used for name matching is cached (0 disables the cache)"
+    )
+    
+    AGENT_VERBOSE: bool = Field(
+        default=False,
+        description="Turn on LangGraph's step-by-step debug trace for the booking agent (other traces log at DEBUG level)"
+    )
+    
     # Meta/WhatsApp Configuration
     META_ACCESS_TOKEN: str = Field(
         ...,
@@ -5,10 +5,15 @@ This module defines the response schemas and formatter for consistent
 frontend rendering of different response types.
 """
 
+import logging
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 
+from langchain_core.prompts import ChatPromptTemplate
+
+logger = logging.getLogger(__name__)
+
 
 class ResponseType(str, Enum):
     """Enum for different response types."""
@@ -150,21 +155,10 @@ class StructuredResponse(BaseModel):
         extra = "allow"  # Allow extra fields from LLM
 
 
-class ResponseFormatterAgent:
-    """Separate agent for formatting responses into structured format."""
-    
-    def __init__(self):
-        from app.agents.llm_factory import get_llm
-        
-        # Create separate LLM instance for formatting
-        self.llm = get_llm(temperature=0)
-        # Use function_calling method to avoid strict schema constraints
-        self.structured_llm = self.llm.with_structured_output(
-            StructuredResponse,
-            method="function_calling"
-        )
-        
-        self.formatting_prompt = """
+# Formatter instructions are identical on every call, so they are built once
+# per process and sent as a leading system message; only the raw response
+# (the human message) changes between calls.
+_FORMATTING_INSTRUCTIONS = """
 You are a response formatter. Your job is to take a raw agent response and convert it into a structured format for the frontend.
 
 ANALYZE the raw response and determine what type(s) of content it contains:
@@ -376,11 +370,29 @@ Output:
   ]
 }}
 
-Raw agent response to format:
-{raw_response}
-
 IMPORTANT: ONLY extract information that is EXPLICITLY present in the raw response. DO NOT add empty fields! If there are multiple parts (like property list + follow-up message), create multiple response objects.
 """
+
+FORMATTING_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", _FORMATTING_INSTRUCTIONS),
+    ("human", "Raw agent response to format:\n{raw_response}")
+])
+
+
+class ResponseFormatterAgent:
+    """Separate agent for formatting responses into structured format."""
+    
+    def __init__(self):
+        from app.agents.llm_factory import get_llm
+        
+        # Create separate LLM instance for formatting; formatting is a pure
+        # function of the reply, so repeats can come from the response cache
+        self.llm = get_llm(temperature=0, cached=True)
+        # Use function_calling method to avoid strict schema constraints
+        self.structured_llm = self.llm.with_structured_output(
+            StructuredResponse,
+            method="function_calling"
+        )
     
     def format_response(self, raw_response: str) -> Dict[str, Any]:
         """
@@ -393,107 +405,108 @@ IMPORTANT: ONLY extract information that is EXPLICITLY present in the raw respon
             Structured response dictionary for frontend
         """
         try:
-            print("\n" + "="*80)
-            print("📥 FORMATTER AGENT - INPUT")
-            print("="*80)
-            print(f"Raw Response Length: {len(raw_response)} characters")
-            print(f"Raw Response Preview: {raw_response[:500]}...")
-            print("="*80 + "\n")
+            logger.debug(
+                "📥 Formatter input (%d chars): %s...",
+                len(raw_response), raw_response[:500]
+            )
             
             # Use structured LLM to format the response
-            formatted_prompt = self.formatting_prompt.format(raw_response=raw_response)
-            
-            structured_response = self.structured_llm.invoke(formatted_prompt)
+            structured_response = self.structured_llm.invoke(
+                FORMATTING_PROMPT.format_messages(raw_response=raw_response)
+            )
             
-            print("\n" + "="*80)
-            print("📤 FORMATTER AGENT - OUTPUT (Structured)")
-            print("="*80)
-            print(f"Response Type: {type(structured_response)}")
-            print(f"Number of Responses: {len(structured_response.responses) if hasattr(structured_response, 'responses') else 'N/A'}")
-            if hasattr(structured_response, 'responses'):
-                for idx, resp in enumerate(structured_response.responses):
-                    print(f"\n  Response {idx + 1}:")
-                    print(f"    Type: {resp.type}")
-                    print(f"    Main Message: {resp.main_message[:100]}..." if len(resp.main_message) > 100 else f"    Main Message: {resp.main_message}")
-                    
-                    # Print type-specific details
-                    if resp.type == 'info' and hasattr(resp, 'info'):
-                        print(f"    Info Keys: {list(resp.info.keys())}")
-                        for key, value in resp.info.items():
-                            if isinstance(value, list):
-                                print(f"      {key}: {len(value)} items - {value[:3]}...")
-                            elif isinstance(value, dict):
-                                print(f"      {key}: {list(value.keys())}")
-                            else:
-                                print(f"      {key}: {str(value)[:100]}")
-                    
-                    elif resp.type == 'questions' and hasattr(resp, 'questions'):
-                        print(f"    Questions Count: {len(resp.questions)}")
-                        for q_idx, q in enumerate(resp.questions):
-                            print(f"      Q{q_idx + 1}: id={q.id}, type={q.type}, required={q.required}")
-                    
-                    elif resp.type == 'media' and hasattr(resp, 'media'):
-                        print(f"    Images: {len(resp.media.images) if resp.media.images else 0}")
-                        print(f"    Videos: {len(resp.media.videos) if resp.media.videos else 0}")
-                        if resp.media.images:
-                            print(f"      First Image: {resp.media.images[0][:80]}...")
-                    
-                    elif resp.type == 'property_list' and hasattr(resp, 'properties'):
-                        print(f"    Properties Count: {len(resp.properties)}")
-                        for p_idx, p in enumerate(resp.properties[:3]):
-                            print(f"      P{p_idx + 1}: {p.name} - Rs. {p.price}")
-            print("="*80 + "\n")
+            # The dumps below walk every response item; skip building them
+            # unless debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_structured_output(structured_response)
             
             # Convert to frontend format
             frontend_response = self._convert_to_frontend_format(structured_response)
             
-            print("\n" + "="*80)
-            print("🎨 FORMATTER AGENT - FRONTEND FORMAT")
-            print("="*80)
-            print(f"Status: {frontend_response.get('status')}")
-            print(f"Response Count: {frontend_response.get('response_count')}")
-            print(f"Response Types: {[r.get('type') for r in frontend_response.get('responses', [])]}")
-            
-            # Print detailed content for each response
-            for idx, resp in enumerate(frontend_response.get('responses', [])):
-                print(f"\n  Frontend Response {idx + 1}:")
-                print(f"    Type: {resp.get('type')}")
-                print(f"    Main Message: {resp.get('main_message', '')[:100]}...")
-                
-                if resp.get('type') == 'info' and resp.get('info'):
-                    print(f"    Info Data:")
-                    for key, value in resp.get('info', {}).items():
-                        if isinstance(value, list):
-                            print(f"      {key}: {len(value)} items")
-                        elif isinstance(value, dict):
-                            print(f"      {key}: {len(value)} keys")
-                        else:
-                            print(f"      {key}: {str(value)[:80]}")
-                
-                elif resp.get('type') == 'questions' and resp.get('questions'):
-                    print(f"    Questions: {len(resp.get('questions', []))} questions")
-                    for q in resp.get('questions', []):
-                        print(f"      - {q.get('id')}: {q.get('type')} ({'required' if q.get('required') else 'optional'})")
-                
-                elif resp.get('type') == 'media' and resp.get('media'):
-                    media = resp.get('media', {})
-                    print(f"    Media: {len(media.get('images', []))} images, {len(media.get('videos', []))} videos")
-            
-            print("="*80 + "\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_frontend_format(frontend_response)
             
             return frontend_response
             
         except Exception as e:
-            print("\n" + "="*80)
-            print("❌ FORMATTER AGENT - ERROR")
-            print("="*80)
-            print(f"Error Type: {type(e).__name__}")
-            print(f"Error Message: {str(e)}")
-            print("="*80 + "\n")
+            logger.error("❌ Formatter failed (%s): %s", type(e).__name__, e)
             
             # Fallback to simple info response
             return self._create_fallback_response(raw_response)
     
+    def _log_structured_output(self, structured_response: StructuredResponse) -> None:
+        """Log the structured LLM output at DEBUG level."""
+        lines = ["📤 Formatter output (structured)"]
+        lines.append(f"Response Type: {type(structured_response)}")
+        lines.append(f"Number of Responses: {len(structured_response.responses) if hasattr(structured_response, 'responses') else 'N/A'}")
+        if hasattr(structured_response, 'responses'):
+            for idx, resp in enumerate(structured_response.responses):
+                lines.append(f"\n  Response {idx + 1}:")
+                lines.append(f"    Type: {resp.type}")
+                lines.append(f"    Main Message: {resp.main_message[:100]}..." if len(resp.main_message) > 100 else f"    Main Message: {resp.main_message}")
+
+                # Type-specific details
+                if resp.type == 'info' and hasattr(resp, 'info'):
+                    lines.append(f"    Info Keys: {list(resp.info.keys())}")
+                    for key, value in resp.info.items():
+                        if isinstance(value, list):
+                            lines.append(f"      {key}: {len(value)} items - {value[:3]}...")
+                        elif isinstance(value, dict):
+                            lines.append(f"      {key}: {list(value.keys())}")
+                        else:
+                            lines.append(f"      {key}: {str(value)[:100]}")
+
+                elif resp.type == 'questions' and hasattr(resp, 'questions'):
+                    lines.append(f"    Questions Count: {len(resp.questions)}")
+                    for q_idx, q in enumerate(resp.questions):
+                        lines.append(f"      Q{q_idx + 1}: id={q.id}, type={q.type}, required={q.required}")
+
+                elif resp.type == 'media' and hasattr(resp, 'media'):
+                    lines.append(f"    Images: {len(resp.media.images) if resp.media.images else 0}")
+                    lines.append(f"    Videos: {len(resp.media.videos) if resp.media.videos else 0}")
+                    if resp.media.images:
+                        lines.append(f"      First Image: {resp.media.images[0][:80]}...")
+
+                elif resp.type == 'property_list' and hasattr(resp, 'properties'):
+                    lines.append(f"    Properties Count: {len(resp.properties)}")
+                    for p_idx, p in enumerate(resp.properties[:3]):
+                        lines.append(f"      P{p_idx + 1}: {p.name} - Rs. {p.price}")
+        logger.debug("\n".join(lines))
+    
+    def _log_frontend_format(self, frontend_response: Dict[str, Any]) -> None:
+        """Log the converted frontend payload at DEBUG level."""
+        lines = ["🎨 Formatter frontend payload"]
+        lines.append(f"Status: {frontend_response.get('status')}")
+        lines.append(f"Response Count: {frontend_response.get('response_count')}")
+        lines.append(f"Response Types: {[r.get('type') for r in frontend_response.get('responses', [])]}")
+
+        # Detailed content for each response
+        for idx, resp in enumerate(frontend_response.get('responses', [])):
+            lines.append(f"\n  Frontend Response {idx + 1}:")
+            lines.append(f"    Type: {resp.get('type')}")
+            lines.append(f"    Main Message: {resp.get('main_message', '')[:100]}...")
+
+            if resp.get('type') == 'info' and resp.get('info'):
+                lines.append("    Info Data:")
+                for key, value in resp.get('info', {}).items():
+                    if isinstance(value, list):
+                        lines.append(f"      {key}: {len(value)} items")
+                    elif isinstance(value, dict):
+                        lines.append(f"      {key}: {len(value)} keys")
+                    else:
+                        lines.append(f"      {key}: {str(value)[:80]}")
+
+            elif resp.get('type') == 'questions' and resp.get('questions'):
+                lines.append(f"    Questions: {len(resp.get('questions', []))} questions")
+                for q in resp.get('questions', []):
+                    lines.append(f"      - {q.get('id')}: {q.get('type')} ({'required' if q.get('required') else 'optional'})")
+
+            elif resp.get('type') == 'media' and resp.get('media'):
+                media = resp.get('media', {})
+                lines.append(f"    Media: {len(media.get('images', []))} images, {len(media.get('videos', []))} videos")
+
+        logger.debug("\n".join(lines))
+    
     def _convert_to_frontend_format(self, structured_response: StructuredResponse) -> Dict[str, Any]:
         """Convert Pydantic response to frontend dictionary."""
         formatted_responses = []
@@ -10,11 +10,16 @@ SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     poolclass=QueuePool,
-    pool_size=5,                    # Number of connections to keep open
-    max_overflow=10,                # Additional connections when pool is full
+    # Each booking turn holds several connections at once (user + memory
+    # loads, the user-message write, parallel read-only tools), so the
+    # pool is sized for concurrent webhooks rather than one per request
+    pool_size=settings.DB_POOL_SIZE,          # Number of connections to keep open
+    max_overflow=settings.DB_MAX_OVERFLOW,    # Additional connections when pool is full
     pool_pre_ping=True,             # Validate connections before use
     pool_recycle=3600,              # Recycle connections every hour (3600 seconds)
     pool_timeout=30,                # Timeout when getting connection from pool
+    pool_use_lifo=True,             # Reuse the most recently returned connection first
+    query_cache_size=1200,          # Compiled-statement cache entries (default 500)
     connect_args={
         "sslmode": "require",
         "connect_timeout": 30,
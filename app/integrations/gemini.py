@@ -7,17 +7,36 @@ This module provides integration with Google's Gemini AI for:
 - Image content analysis
 """
 
-import google.genai as genai
 import requests
-from PIL import Image
 import io
 import json
 import logging
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool for screenshot downloads; a bare requests.get() opens a
+# fresh connection (and TLS handshake) to the media host on every call
+_http = requests.Session()
+
+
+@lru_cache(maxsize=1)
+def _get_genai_client():
+    """
+    Build the process-wide google.genai client.
+    
+    GeminiClient is created per request (see get_gemini_client), so each
+    instance used to open its own HTTP pool. Sharing one client keeps its
+    connections to the Gemini API alive across requests.
+    """
+    # Imported here: the SDK takes over a second to import and is only
+    # needed once a payment screenshot actually has to be analysed
+    import google.genai as genai
+    
+    return genai.Client(api_key=settings.GOOGLE_API_KEY)
+
 
 class GeminiClient:
     """
@@ -30,7 +49,7 @@ class GeminiClient:
     def __init__(self):
         """Initialize Gemini client with API key from settings."""
         try:
-            self.client = genai.Client(api_key=settings.GOOGLE_API_KEY)
+            self.client = _get_genai_client()
             logger.info("GeminiClient initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize GeminiClient: {e}")
@@ -64,7 +83,7 @@ class GeminiClient:
         try:
             # Download image from URL
             logger.info(f"Downloading image from URL: {image_url}")
-            response = requests.get(image_url, timeout=10)
+            response = _http.get(image_url, timeout=10)
             
             if response.status_code != 200:
                 logger.error(f"Failed to download image: HTTP {response.status_code}")
@@ -76,6 +95,7 @@ class GeminiClient:
                 }
             
             # Load image using PIL
+            from PIL import Image
             image = Image.open(io.BytesIO(response.content))
             logger.info(f"Image loaded successfully: {image.size}")
             
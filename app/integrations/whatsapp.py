@@ -5,12 +5,50 @@ This module provides a client for sending messages and media through the
 WhatsApp Business API (Meta Graph API).
 """
 
+import asyncio
 import httpx
-import time
 from typing import Dict, List, Optional, Any
 from app.core.config import settings
 
 
+# One keep-alive pool shared by every WhatsAppClient while the app runs; a
+# fresh AsyncClient per send paid a TCP + TLS handshake to graph.facebook.com
+# for each message, and a reply with media sends several in a row. It is
+# opened and closed by the app lifespan (app/main.py) so it lives and dies on
+# the serving event loop - httpx connections can't be closed from another.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def start_http_client() -> None:
+    """Open the shared HTTP client (called on app startup)."""
+    global _http_client
+    
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections (app shutdown)."""
+    global _http_client
+    
+    client, _http_client = _http_client, None
+    if client is not None:
+        await client.aclose()
+
+
+async def _post(url: str, **kwargs) -> httpx.Response:
+    """
+    POST through the shared client, or a one-off client outside the app
+    (scripts, tests) where no shared client was started.
+    """
+    if _http_client is not None:
+        return await _http_client.post(url, **kwargs)
+    async with httpx.AsyncClient() as client:
+        return await client.post(url, **kwargs)
+
+
 class WhatsAppClient:
     """
     Client for WhatsApp Business API operations.
@@ -201,39 +239,39 @@ class WhatsAppClient:
         # Retry logic
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        self.base_url,
-                        json=payload,
-                        headers=headers
-                    )
+                response = await _post(
+                    self.base_url,
+                    json=payload,
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    message_id = data.get("messages", [{}])[0].get("id", "")
+                    return {
+                        "success": True,
+                        "message_id": message_id
+                    }
+                else:
+                    error_msg = f"HTTP {response.status_code}: {response.text}"
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        message_id = data.get("messages", [{}])[0].get("id", "")
-                        return {
-                            "success": True,
-                            "message_id": message_id
-                        }
-                    else:
-                        error_msg = f"HTTP {response.status_code}: {response.text}"
-                        
-                        # Don't retry on client errors (4xx)
-                        if 400 <= response.status_code < 500:
-                            return {
-                                "success": False,
-                                "error": error_msg
-                            }
-                        
-                        # Retry on server errors (5xx)
-                        if attempt < self.max_retries - 1:
-                            await self._wait_before_retry(attempt)
-                            continue
-                        
+                    # Don't retry on client errors (4xx)
+                    if 400 <= response.status_code < 500:
                         return {
                             "success": False,
                             "error": error_msg
                         }
+                    
+                    # Retry on server errors (5xx)
+                    if attempt < self.max_retries - 1:
+                        await self._wait_before_retry(attempt)
+                        continue
+                    
+                    return {
+                        "success": False,
+                        "error": error_msg
+                    }
             
             except httpx.TimeoutException:
                 if attempt < self.max_retries - 1:
@@ -292,39 +330,39 @@ class WhatsAppClient:
         # Retry logic
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        self.base_url,
-                        json=payload,
-                        headers=headers
-                    )
+                response = await _post(
+                    self.base_url,
+                    json=payload,
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    message_id = data.get("messages", [{}])[0].get("id", "")
+                    return {
+                        "success": True,
+                        "message_id": message_id
+                    }
+                else:
+                    error_msg = f"HTTP {response.status_code}: {response.text}"
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        message_id = data.get("messages", [{}])[0].get("id", "")
-                        return {
-                            "success": True,
-                            "message_id": message_id
-                        }
-                    else:
-                        error_msg = f"HTTP {response.status_code}: {response.text}"
-                        
-                        # Don't retry on client errors (4xx)
-                        if 400 <= response.status_code < 500:
-                            return {
-                                "success": False,
-                                "error": error_msg
-                            }
-                        
-                        # Retry on server errors (5xx)
-                        if attempt < self.max_retries - 1:
-                            await self._wait_before_retry(attempt)
-                            continue
-                        
+                    # Don't retry on client errors (4xx)
+                    if 400 <= response.status_code < 500:
                         return {
                             "success": False,
                             "error": error_msg
                         }
+                    
+                    # Retry on server errors (5xx)
+                    if attempt < self.max_retries - 1:
+                        await self._wait_before_retry(attempt)
+                        continue
+                    
+                    return {
+                        "success": False,
+                        "error": error_msg
+                    }
             
             except httpx.TimeoutException:
                 if attempt < self.max_retries - 1:
@@ -358,7 +396,3 @@ class WhatsAppClient:
         """
         wait_time = self.retry_delay * (2 ** attempt)  # Exponential backoff
         await asyncio.sleep(wait_time)
-
-
-# Import asyncio at the end to avoid circular import issues
-import asyncio
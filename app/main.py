@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 # from app.routers import agent  # REMOVED: Old router causing startup issues
@@ -11,6 +12,7 @@ import logging
 from typing import Optional
 from datetime import datetime, timedelta
 from app.tasks import start_cleanup_scheduler
+from app.integrations.whatsapp import start_http_client, close_http_client
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 
@@ -19,7 +21,16 @@ models.Base.metadata.create_all(bind=engine)
 
 start_cleanup_scheduler()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared WhatsApp HTTP pool, opened and closed on the serving event loop
+    start_http_client()
+    yield
+    await close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Old agent router removed - functionality moved to app/api/v1/
 # app.include_router(agent.router)
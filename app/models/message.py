@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, JSON, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, JSON, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from pgvector.sqlalchemy import Vector
 from app.database import Base
@@ -23,8 +23,15 @@ class Message(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     whatsapp_message_id = Column(String(100), nullable=True)
 
-    query_embedding = Column(Vector(3072), nullable=True)  # use correct dimension
+    # Deferred: ~12 KB per row and not needed by any history/listing query;
+    # loaded on first attribute access only
+    query_embedding = deferred(Column(Vector(3072), nullable=True))  # use correct dimension
     user = relationship("User", backref="messages")
 
+    __table_args__ = (
+        # Recent-history reads: latest N messages for a user
+        Index("idx_messages_user_timestamp", "user_id", timestamp.desc()),
+    )
+
 
 
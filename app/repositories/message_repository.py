@@ -5,15 +5,33 @@ This module provides data access methods for message-related operations,
 including retrieving user messages, chat history, and saving messages.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select, tuple_
 
 from app.repositories.base import BaseRepository
 from app.models.message import Message
 
 
+def _latest_messages(conditions, limit: int, *columns):
+    """
+    Subquery of the newest `limit` messages matching `conditions`.
+    
+    Walks idx_messages_user_timestamp (user_id, timestamp DESC) backwards
+    and stops after `limit` rows; id breaks timestamp ties. The selected
+    columns plus id and timestamp are exposed so the outer query can put
+    the rows back in chronological order in SQL.
+    """
+    return (
+        select(*columns, Message.id, Message.timestamp)
+        .where(*conditions)
+        .order_by(desc(Message.timestamp), desc(Message.id))
+        .limit(limit)
+        .subquery()
+    )
+
+
 class MessageRepository(BaseRepository[Message]):
     """
     Repository for message-related database operations.
@@ -59,37 +77,80 @@ class MessageRepository(BaseRepository[Message]):
         db: Session,
         user_id,
         limit: int = 50,
-        oldest_first: bool = True
+        oldest_first: bool = True,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None
     ) -> List[Message]:
         """
         Retrieve chat history for a user.
         
         This method retrieves the most recent messages and can optionally
-        reverse the order to show oldest messages first (typical chat display).
+        return them oldest first (typical chat display). Older pages are
+        fetched by passing the timestamp and id of the oldest message
+        already loaded as `before` and `before_id` (keyset pagination),
+        which stays an index range scan however far back the page is.
+        Messages are ordered by (timestamp, id), so rows sharing the
+        boundary timestamp are neither skipped nor repeated.
         
         Args:
             db: Database session
             user_id: User's unique identifier (UUID)
             limit: Maximum number of messages to retrieve
             oldest_first: If True, returns oldest messages first; if False, newest first
+            before: Only return messages sent strictly before this time
+                (or, with before_id, before this (timestamp, id) position)
+            before_id: ID of the message `before` was taken from
             
         Returns:
             List of Message instances
         """
-        # Query most recent messages first
-        messages = (
+        conditions = [Message.user_id == user_id]
+        if before is not None and before_id is not None:
+            conditions.append(tuple_(Message.timestamp, Message.id) < tuple_(before, before_id))
+        elif before is not None:
+            conditions.append(Message.timestamp < before)
+        
+        if not oldest_first:
+            return (
+                db.query(Message)
+                .filter(*conditions)
+                .order_by(desc(Message.timestamp), desc(Message.id))
+                .limit(limit)
+                .all()
+            )
+        
+        latest = _latest_messages(conditions, limit)
+        return (
             db.query(Message)
-            .filter(Message.user_id == user_id)
-            .order_by(desc(Message.timestamp))
-            .limit(limit)
+            .join(latest, Message.id == latest.c.id)
+            .order_by(latest.c.timestamp, latest.c.id)
             .all()
         )
+    
+    def get_recent_turns(
+        self,
+        db: Session,
+        user_id,
+        limit: int
+    ) -> List[Tuple[str, str]]:
+        """
+        Retrieve the latest (sender, content) pairs for a user.
         
-        # Reverse to show oldest first if requested
-        if oldest_first:
-            messages = list(reversed(messages))
+        Lighter than get_chat_history() for callers that only feed the
+        conversation to a model: no Message objects are built.
         
-        return messages
+        Args:
+            db: Database session
+            user_id: User's unique identifier (UUID)
+            limit: Maximum number of messages to retrieve
+            
+        Returns:
+            Up to `limit` (sender, content) rows, oldest first
+        """
+        latest = _latest_messages([Message.user_id == user_id], limit, Message.sender, Message.content)
+        return db.execute(
+            select(latest.c.sender, latest.c.content).order_by(latest.c.timestamp, latest.c.id)
+        ).all()
     
     def save_message(
         self,
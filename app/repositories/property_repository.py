@@ -21,6 +21,106 @@ from app.models.property import (
 )
 
 
+# Constant statements are built once so SQLAlchemy reuses their compiled
+# form; the booking-conflict checks run once per candidate property.
+
+# Day/Night/Full Day/Full Night on the same date (Full Day request)
+_ANY_SHIFT_ON_DATE_SQL = text("""
+    SELECT 1 FROM bookings
+    WHERE property_id = :pid 
+    AND booking_date = :date
+    AND shift_type IN ('Day', 'Night', 'Full Day', 'Full Night')
+    AND status IN ('Pending', 'Confirmed')
+""")
+
+# Full Night on the previous date spills into this date's Day shift
+_FULL_NIGHT_ON_PREV_DATE_SQL = text("""
+    SELECT 1 FROM bookings
+    WHERE property_id = :pid 
+    AND booking_date = :prev_date
+    AND shift_type = 'Full Night'
+    AND status IN ('Pending', 'Confirmed')
+""")
+
+# Anything occupying the night of the date (Night / Full Night requests)
+_NIGHT_SHIFT_ON_DATE_SQL = text("""
+    SELECT 1 FROM bookings
+    WHERE property_id = :pid 
+    AND booking_date = :date
+    AND shift_type IN ('Night', 'Full Day', 'Full Night')
+    AND status IN ('Pending', 'Confirmed')
+""")
+
+# Anything occupying the day after (Full Night request)
+_DAY_SHIFT_ON_NEXT_DATE_SQL = text("""
+    SELECT 1 FROM bookings
+    WHERE property_id = :pid 
+    AND booking_date = :next_date
+    AND shift_type IN ('Day', 'Full Day', 'Full Night')
+    AND status IN ('Pending', 'Confirmed')
+""")
+
+# Anything occupying the day of the date (Day request)
+_DAY_SHIFT_ON_DATE_SQL = text("""
+    SELECT 1 FROM bookings
+    WHERE property_id = :pid 
+    AND booking_date = :date
+    AND shift_type IN ('Day', 'Full Day')
+    AND status IN ('Pending', 'Confirmed')
+""")
+
+_ALL_PRICING_SQL = text("""
+    SELECT psp.day_of_week, psp.shift_type, psp.price
+    FROM property_pricing pp
+    JOIN property_shift_pricing psp ON pp.pricing_id = psp.pricing_id
+    WHERE pp.property_id = :property_id
+    ORDER BY 
+      CASE psp.day_of_week 
+        WHEN 'monday' THEN 1
+        WHEN 'tuesday' THEN 2
+        WHEN 'wednesday' THEN 3
+        WHEN 'thursday' THEN 4
+        WHEN 'friday' THEN 5
+        WHEN 'saturday' THEN 6
+        WHEN 'sunday' THEN 7
+      END,
+      CASE psp.shift_type
+        WHEN 'Day' THEN 1
+        WHEN 'Night' THEN 2
+        WHEN 'Full Day' THEN 3
+        WHEN 'Full Night' THEN 4
+      END
+""")
+
+_IMAGES_SQL = text("""
+    SELECT DISTINCT pi.image_url 
+    FROM property_images pi
+    WHERE pi.property_id = :property_id
+    AND pi.image_url IS NOT NULL
+    AND pi.image_url != ''
+""")
+
+_VIDEOS_SQL = text("""
+    SELECT DISTINCT pv.video_url 
+    FROM property_videos pv
+    WHERE pv.property_id = :property_id
+    AND pv.video_url IS NOT NULL
+    AND pv.video_url != ''
+""")
+
+_AMENITIES_SQL = text("""
+    SELECT pa.type, pa.value 
+    FROM property_amenities pa
+    WHERE pa.property_id = :property_id
+""")
+
+_PROPERTY_DETAILS_SQL = text("""
+    SELECT p.name, p.description, p.city, p.country, p.max_occupancy, p.address
+    FROM properties p
+    WHERE p.property_id = :property_id
+""")
+
+
 class PropertyRepository(BaseRepository[Property]):
     """
     Repository for property-related database operations.
@@ -155,27 +255,13 @@ class PropertyRepository(BaseRepository[Property]):
                     prev_date = (booking_date - timedelta(days=1)).date()
                     
                     # Check same date
-                    booking_sql_same = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :date
-                        AND shift_type IN ('Day', 'Night', 'Full Day', 'Full Night')
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking_same = db.execute(text(booking_sql_same), {
+                    booking_same = db.execute(_ANY_SHIFT_ON_DATE_SQL, {
                         "pid": property_id,
                         "date": booking_date.date()
                     }).first()
                     
                     # Check previous date for Full Night
-                    booking_sql_prev = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :prev_date
-                        AND shift_type = 'Full Night'
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking_prev = db.execute(text(booking_sql_prev), {
+                    booking_prev = db.execute(_FULL_NIGHT_ON_PREV_DATE_SQL, {
                         "pid": property_id,
                         "prev_date": prev_date
                     }).first()
@@ -188,27 +274,13 @@ class PropertyRepository(BaseRepository[Property]):
                     next_date = (booking_date + timedelta(days=1)).date()
                     
                     # Check booking_date for Night, Full Day, Full Night
-                    booking_sql_same = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :date
-                        AND shift_type IN ('Night', 'Full Day', 'Full Night')
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking_same = db.execute(text(booking_sql_same), {
+                    booking_same = db.execute(_NIGHT_SHIFT_ON_DATE_SQL, {
                         "pid": property_id,
                         "date": booking_date.date()
                     }).first()
                     
                     # Check next_date for Day, Full Day, Full Night
-                    booking_sql_next = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :next_date
-                        AND shift_type IN ('Day', 'Full Day', 'Full Night')
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking_next = db.execute(text(booking_sql_next), {
+                    booking_next = db.execute(_DAY_SHIFT_ON_NEXT_DATE_SQL, {
                         "pid": property_id,
                         "next_date": next_date
                     }).first()
@@ -221,27 +293,13 @@ class PropertyRepository(BaseRepository[Property]):
                     prev_date = (booking_date - timedelta(days=1)).date()
                     
                     # Check same date
-                    booking_sql_same = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :date
-                        AND shift_type IN ('Day', 'Full Day')
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking_same = db.execute(text(booking_sql_same), {
+                    booking_same = db.execute(_DAY_SHIFT_ON_DATE_SQL, {
                         "pid": property_id,
                         "date": booking_date.date()
                     }).first()
                     
                     # Check previous date for Full Night
-                    booking_sql_prev = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :prev_date
-                        AND shift_type = 'Full Night'
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking_prev = db.execute(text(booking_sql_prev), {
+                    booking_prev = db.execute(_FULL_NIGHT_ON_PREV_DATE_SQL, {
                         "pid": property_id,
                         "prev_date": prev_date
                     }).first()
@@ -251,14 +309,7 @@ class PropertyRepository(BaseRepository[Property]):
                         
                 elif shift_type == "Night":
                     # Night conflicts with: Night, Full Day, Full Night on same date
-                    booking_sql = """
-                        SELECT 1 FROM bookings
-                        WHERE property_id = :pid 
-                        AND booking_date = :date
-                        AND shift_type IN ('Night', 'Full Day', 'Full Night')
-                        AND status IN ('Pending', 'Confirmed')
-                    """
-                    booking = db.execute(text(booking_sql), {
+                    booking = db.execute(_NIGHT_SHIFT_ON_DATE_SQL, {
                         "pid": property_id,
                         "date": booking_date.date()
                     }).first()
@@ -332,30 +383,7 @@ class PropertyRepository(BaseRepository[Property]):
         Returns:
             List of dictionaries containing day, shift, and price information
         """
-        sql = """
-            SELECT psp.day_of_week, psp.shift_type, psp.price
-            FROM property_pricing pp
-            JOIN property_shift_pricing psp ON pp.pricing_id = psp.pricing_id
-            WHERE pp.property_id = :property_id
-            ORDER BY 
-              CASE psp.day_of_week 
-                WHEN 'monday' THEN 1
-                WHEN 'tuesday' THEN 2
-                WHEN 'wednesday' THEN 3
-                WHEN 'thursday' THEN 4
-                WHEN 'friday' THEN 5
-                WHEN 'saturday' THEN 6
-                WHEN 'sunday' THEN 7
-              END,
-              CASE psp.shift_type
-                WHEN 'Day' THEN 1
-                WHEN 'Night' THEN 2
-                WHEN 'Full Day' THEN 3
-                WHEN 'Full Night' THEN 4
-              END
-        """
-        
-        results = db.execute(text(sql), {"property_id": property_id}).fetchall()
+        results = db.execute(_ALL_PRICING_SQL, {"property_id": property_id}).fetchall()
         
         pricing_list = []
         for day_of_week, shift_type, price in results:
@@ -382,15 +410,7 @@ class PropertyRepository(BaseRepository[Property]):
         Returns:
             List of image URLs
         """
-        sql = """
-            SELECT DISTINCT pi.image_url 
-            FROM property_images pi
-            WHERE pi.property_id = :property_id
-            AND pi.image_url IS NOT NULL
-            AND pi.image_url != ''
-        """
-        
-        result = db.execute(text(sql), {"property_id": property_id}).fetchall()
+        result = db.execute(_IMAGES_SQL, {"property_id": property_id}).fetchall()
         image_urls = [row[0].strip() for row in result if row[0] and row[0].strip()]
         
         return image_urls
@@ -410,15 +430,7 @@ class PropertyRepository(BaseRepository[Property]):
         Returns:
             List of video URLs
         """
-        sql = """
-            SELECT DISTINCT pv.video_url 
-            FROM property_videos pv
-            WHERE pv.property_id = :property_id
-            AND pv.video_url IS NOT NULL
-            AND pv.video_url != ''
-        """
-        
-        result = db.execute(text(sql), {"property_id": property_id}).fetchall()
+        result = db.execute(_VIDEOS_SQL, {"property_id": property_id}).fetchall()
         video_urls = [row[0].strip() for row in result if row[0] and row[0].strip()]
         
         return video_urls
@@ -438,13 +450,7 @@ class PropertyRepository(BaseRepository[Property]):
         Returns:
             List of dictionaries containing amenity type and value
         """
-        sql = """
-            SELECT pa.type, pa.value 
-            FROM property_amenities pa
-            WHERE pa.property_id = :property_id
-        """
-        
-        results = db.execute(text(sql), {"property_id": property_id}).fetchall()
+        results = db.execute(_AMENITIES_SQL, {"property_id": property_id}).fetchall()
         
         amenities = []
         seen = set()
@@ -476,13 +482,7 @@ class PropertyRepository(BaseRepository[Property]):
             Dictionary containing all property information, or None if not found
         """
         # Get basic property info
-        sql = """
-            SELECT p.name, p.description, p.city, p.country, p.max_occupancy, p.address
-            FROM properties p
-            WHERE p.property_id = :property_id
-        """
-        
-        result = db.execute(text(sql), {"property_id": property_id}).first()
+        result = db.execute(_PROPERTY_DETAILS_SQL, {"property_id": property_id}).first()
         
         if not result:
             return None
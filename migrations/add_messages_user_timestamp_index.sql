@@ -0,0 +1,7 @@
+-- Migration: Add composite (user_id, timestamp DESC) index to messages table
+-- Date: 2026-10-17
+-- Description: Serves "latest N messages for a user" reads from the index
+--              instead of sorting every message the user has ever sent
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_user_timestamp
+ON messages (user_id, timestamp DESC);
@@ -6,83 +6,307 @@ This script adds the required fields for the LangGraph memory system:
 - summary_updated_at: Timestamp of last summary update
 - summary_generation_count: Counter for adaptive compression
 - needs_summarization: Flag set by tools when state changes
+
+It also creates a partial index on sessions pending summarization.
 """
 
-from sqlalchemy import text
+import logging
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Set, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
 from app.database import engine
 
+logger = logging.getLogger(__name__)
+
+# Rows updated per transaction when backfilling defaults
+BACKFILL_BATCH_SIZE = 1000
+
+# Memory columns managed by this migration: (name, type, default)
+# Add new memory fields here - the statements below are generated from it.
+MEMORY_COLUMNS = [
+    ("conversation_summary", "TEXT", None),
+    ("summary_updated_at", "TIMESTAMP", None),
+    ("summary_generation_count", "INTEGER", "0"),
+    ("needs_summarization", "BOOLEAN", "FALSE"),
+]
+
+MEMORY_COLUMN_NAMES = [name for name, _, _ in MEMORY_COLUMNS]
+
+# Partial index used by the summarization sweep
+SUMMARIZATION_INDEX = "idx_sessions_needs_summarization"
+
+# Keep the existence checks from queueing behind live traffic
+INTROSPECTION_LOCK_TIMEOUT = "2s"
+INTROSPECTION_STATEMENT_TIMEOUT = "10s"
+
+# Advisory lock key shared by every process running this migration
+MIGRATION_LOCK_NAME = "migrate_sessions_memory_fields"
+
+# Statements that never change between runs are built once at import time,
+# so repeated invocations reuse the same TextClause objects.
+_LOCK_TIMEOUT_SQL = text(f"SET LOCAL lock_timeout = '{INTROSPECTION_LOCK_TIMEOUT}'")
+_STATEMENT_TIMEOUT_SQL = text(f"SET LOCAL statement_timeout = '{INTROSPECTION_STATEMENT_TIMEOUT}'")
+
+_ADVISORY_LOCK_SQL = text(f"SELECT pg_advisory_lock(hashtext('{MIGRATION_LOCK_NAME}'))")
+_ADVISORY_UNLOCK_SQL = text(f"SELECT pg_advisory_unlock(hashtext('{MIGRATION_LOCK_NAME}'))")
+
+_CREATE_SUMMARIZATION_INDEX_SQL = text(f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS {SUMMARIZATION_INDEX}
+    ON sessions (id)
+    WHERE needs_summarization = TRUE;
+""")
+
+_DEFAULTED_COLUMNS = [(name, default) for name, _, default in MEMORY_COLUMNS if default is not None]
+
+_BACKFILL_SQL = text(f"""
+    UPDATE sessions
+    SET {", ".join(f"{name} = COALESCE({name}, {default})" for name, default in _DEFAULTED_COLUMNS)}
+    WHERE id IN (
+        SELECT id FROM sessions
+        WHERE {" OR ".join(f"{name} IS NULL" for name, _ in _DEFAULTED_COLUMNS)}
+        LIMIT :batch_size
+    );
+""")
+
+
+def columns_present(conn, table: str, names: List[str]) -> Set[str]:
+    """
+    Return which of the given columns exist on a table.
+    
+    Uses SQLAlchemy's Inspector, which reflects all columns of the table in
+    one round trip with the dialect's own catalog query.
+    
+    Args:
+        conn: Database connection
+        table: Table name
+        names: Column names to look for
+        
+    Returns:
+        Set of column names from `names` that exist on the table
+    """
+    reflected = {column["name"] for column in inspect(conn).get_columns(table)}
+    return reflected & set(names)
+
+
+def _set_introspection_timeouts(conn):
+    """
+    Bound how long catalog reads may wait on or run against a busy primary.
+    
+    SET LOCAL only lasts until the end of the current transaction.
+    
+    Args:
+        conn: Database connection (inside a transaction)
+    """
+    conn.execute(_LOCK_TIMEOUT_SQL)
+    conn.execute(_STATEMENT_TIMEOUT_SQL)
 
-def add_memory_fields():
-    """Add memory management fields to sessions table."""
+
+@lru_cache(maxsize=32)
+def _cached_columns(bind: Engine, table: str, names: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Cached columns_present() lookup, keyed by engine.
+    
+    Repeated migration runs in the same process (test fixtures, app startup)
+    skip the catalog query. Cleared whenever this module may alter the schema,
+    or explicitly via clear_schema_cache().
     
-    print("🔧 Adding memory fields to sessions table...")
+    Args:
+        bind: Engine to introspect (primary or read replica)
+        table: Table name
+        names: Column names to look for
+        
+    Returns:
+        Frozen set of column names from `names` that exist on the table
+    """
+    with bind.connect() as conn:
+        _set_introspection_timeouts(conn)
+        return frozenset(columns_present(conn, table, list(names)))
+
+
+@lru_cache(maxsize=32)
+def _cached_indexes(bind: Engine, table: str) -> FrozenSet[str]:
+    """
+    Cached index-name lookup for a table, keyed by engine.
+    
+    Args:
+        bind: Engine to introspect (primary or read replica)
+        table: Table name
+        
+    Returns:
+        Frozen set of index names defined on the table
+    """
+    with bind.connect() as conn:
+        _set_introspection_timeouts(conn)
+        return frozenset(index["name"] for index in inspect(conn).get_indexes(table))
+
+
+def clear_schema_cache():
+    """
+    Drop cached introspection results.
+    
+    Called after this module alters the schema; call it directly when the
+    schema was changed elsewhere (e.g. a test fixture dropped the columns).
+    """
+    _cached_columns.cache_clear()
+    _cached_indexes.cache_clear()
+
+
+def add_memory_fields(
+    report: bool = False,
+    backfill: bool = False,
+    read_engine: Optional[Engine] = None
+):
+    """
+    Add memory management fields to sessions table.
+    
+    All missing columns are added with a single idempotent
+    ADD COLUMN IF NOT EXISTS statement (PostgreSQL 9.6+). A cached existence
+    check short-circuits repeat runs, and a PostgreSQL advisory lock makes
+    concurrent runs wait for each other instead of racing on the DDL.
+    
+    Defaults are applied with a separate ALTER COLUMN ... SET DEFAULT: on
+    PostgreSQL < 11, ADD COLUMN ... DEFAULT rewrites the whole table under an
+    AccessExclusiveLock, while the split form is a metadata-only change.
+    
+    Args:
+        report: If True, query the catalog afterwards and log which
+                memory columns were added
+        backfill: If True, set NULL values of the defaulted columns on
+                  existing rows, committing each batch separately
+        read_engine: Optional engine (e.g. a read replica) used for the
+                     existence checks; DDL always runs on the primary
+    """
+    
+    logger.info("🔧 Adding memory fields to sessions table...")
     
     try:
-        with engine.begin() as conn:
-            # Check if columns already exist
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name='sessions' 
-                AND column_name IN ('conversation_summary', 'summary_updated_at', 'summary_generation_count', 'needs_summarization');
-            """))
-            
-            existing_columns = [row[0] for row in result.fetchall()]
-            
-            # Add conversation_summary if not exists
-            if 'conversation_summary' not in existing_columns:
-                print("  → Adding conversation_summary column...")
-                conn.execute(text("""
-                    ALTER TABLE sessions 
-                    ADD COLUMN conversation_summary TEXT;
-                """))
-                print("    ✅ conversation_summary added")
-            else:
-                print("    ℹ️  conversation_summary already exists")
-            
-            # Add summary_updated_at if not exists
-            if 'summary_updated_at' not in existing_columns:
-                print("  → Adding summary_updated_at column...")
-                conn.execute(text("""
-                    ALTER TABLE sessions 
-                    ADD COLUMN summary_updated_at TIMESTAMP;
-                """))
-                print("    ✅ summary_updated_at added")
-            else:
-                print("    ℹ️  summary_updated_at already exists")
-            
-            # Add summary_generation_count if not exists
-            if 'summary_generation_count' not in existing_columns:
-                print("  → Adding summary_generation_count column...")
-                conn.execute(text("""
-                    ALTER TABLE sessions 
-                    ADD COLUMN summary_generation_count INTEGER DEFAULT 0;
-                """))
-                print("    ✅ summary_generation_count added")
-            else:
-                print("    ℹ️  summary_generation_count already exists")
-            
-            # Add needs_summarization if not exists
-            if 'needs_summarization' not in existing_columns:
-                print("  → Adding needs_summarization column...")
-                conn.execute(text("""
-                    ALTER TABLE sessions 
-                    ADD COLUMN needs_summarization BOOLEAN DEFAULT FALSE;
-                """))
-                print("    ✅ needs_summarization added")
-            else:
-                print("    ℹ️  needs_summarization already exists")
+        introspect_engine = read_engine or engine
+        existing_columns = _cached_columns(introspect_engine, "sessions", tuple(MEMORY_COLUMN_NAMES))
+        existing_indexes = _cached_indexes(introspect_engine, "sessions")
+        
+        # Nothing to do on repeat runs - skip opening the DDL connection
+        if (
+            len(existing_columns) == len(MEMORY_COLUMNS)
+            and SUMMARIZATION_INDEX in existing_indexes
+            and not backfill
+        ):
+            logger.info("ℹ️  All memory fields already present, skipping")
+            return
         
-        print("\n✅ Migration completed successfully!")
-        print("\n📝 Next steps:")
-        print("  1. Update state-changing tools to call mark_state_change()")
-        print("  2. Test the memory system with a conversation")
-        print("  3. Monitor summary generation in logs")
+        # AUTOCOMMIT: every statement commits on its own and releases its
+        # locks immediately instead of holding them for the whole migration
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            # Serialize concurrent migrators (e.g. several replicas starting
+            # at once). A session-level lock is used because a transaction-
+            # level one would be released by the first AUTOCOMMIT statement.
+            conn.execute(_ADVISORY_LOCK_SQL)
+            try:
+                _migrate(conn, report=report, backfill=backfill)
+            finally:
+                conn.execute(_ADVISORY_UNLOCK_SQL)
+        
+        logger.info("✅ Migration completed successfully!")
+        logger.info(
+            "📝 Next steps:\n"
+            "  1. Update state-changing tools to call mark_state_change()\n"
+            "  2. Test the memory system with a conversation\n"
+            "  3. Monitor summary generation in logs"
+        )
         
     except Exception as e:
-        print(f"\n❌ Migration failed: {e}")
+        logger.error("❌ Migration failed: %s", e)
         raise
 
 
+def _migrate(conn, report: bool, backfill: bool):
+    """
+    Apply the missing schema changes while holding the migration lock.
+    
+    Existence is re-read on the primary here: if another process migrated
+    while we waited for the lock, everything is already present and this
+    is a no-op.
+    
+    Args:
+        conn: AUTOCOMMIT connection holding the advisory lock
+        report: Log which memory columns were added
+        backfill: Backfill defaults on existing rows
+    """
+    existing_columns = columns_present(conn, "sessions", MEMORY_COLUMN_NAMES)
+    existing_indexes = {index["name"] for index in inspect(conn).get_indexes("sessions")}
+    missing = [column for column in MEMORY_COLUMNS if column[0] not in existing_columns]
+    
+    for name in MEMORY_COLUMN_NAMES:
+        if name in existing_columns:
+            logger.info("ℹ️  %s already exists", name)
+    
+    if missing:
+        for name, _, _ in missing:
+            logger.info("→ Adding %s column", name)
+        
+        add_clauses = ", ".join(
+            f"ADD COLUMN IF NOT EXISTS {name} {column_type}"
+            for name, column_type, _ in missing
+        )
+        conn.execute(text(f"ALTER TABLE sessions {add_clauses};"))
+        
+        # Defaults only affect new rows - no table rewrite
+        default_clauses = ", ".join(
+            f"ALTER COLUMN {name} SET DEFAULT {default}"
+            for name, _, default in missing
+            if default is not None
+        )
+        if default_clauses:
+            conn.execute(text(f"ALTER TABLE sessions {default_clauses};"))
+    
+    # Partial index for the summarization sweep
+    # (WHERE needs_summarization = TRUE). CONCURRENTLY cannot run
+    # inside a transaction block, which AUTOCOMMIT guarantees.
+    if SUMMARIZATION_INDEX not in existing_indexes:
+        logger.info("→ Creating %s index", SUMMARIZATION_INDEX)
+        conn.execute(_CREATE_SUMMARIZATION_INDEX_SQL)
+    
+    # Schema changed - drop the cached introspection results
+    if missing or SUMMARIZATION_INDEX not in existing_indexes:
+        clear_schema_cache()
+    
+    if report:
+        present = columns_present(conn, "sessions", MEMORY_COLUMN_NAMES)
+        for name, _, _ in missing:
+            if name in present:
+                logger.info("✅ %s added", name)
+    
+    if backfill:
+        _backfill_defaults(conn)
+
+
+def _backfill_defaults(conn, batch_size: int = BACKFILL_BATCH_SIZE):
+    """
+    Backfill defaults on existing rows in small batches.
+    
+    Expects an AUTOCOMMIT connection, so each batch commits on its own and
+    row locks are released between pages instead of being held for the
+    whole table.
+    
+    Args:
+        conn: AUTOCOMMIT database connection
+        batch_size: Number of sessions updated per statement
+    """
+    total = 0
+    
+    while True:
+        result = conn.execute(_BACKFILL_SQL, {"batch_size": batch_size})
+        
+        if result.rowcount == 0:
+            break
+        
+        total += result.rowcount
+        logger.info("→ Backfilled %d sessions", total)
+    
+    logger.info("✅ Backfill complete (%d sessions updated)", total)
+
+
 if __name__ == "__main__":
-    add_memory_fields()
+    logging.basicConfig(level=logging.INFO)
+    # Existing sessions get 0 / FALSE instead of NULL in the counter and flag
+    add_memory_fields(report=True, backfill=True)
@@ -0,0 +1,47 @@
+"""
+Unit tests for AdminAgent command parsing and the no-LLM command path.
+"""
+
+import asyncio
+
+import pytest
+
+from app.agents.admin_agent import AdminAgent, _ADMIN_COMMAND_RE
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("confirm John-2024-01-01-Day", ("confirm", "John-2024-01-01-Day", None)),
+    (
+        "reject John Doe-2024-01-01-Full Day wrong amount",
+        ("reject", "John Doe-2024-01-01-Full Day", "wrong amount"),
+    ),
+    (
+        "Reject `Ali-2025-02-03-Full Night` blurry screenshot",
+        ("Reject", "Ali-2025-02-03-Full Night", "blurry screenshot"),
+    ),
+])
+def test_well_formed_commands_are_parsed(text, expected):
+    match = _ADMIN_COMMAND_RE.match(text)
+
+    assert match is not None
+    assert (match["action"], match["booking_id"], match["reason"]) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "confirm",
+    "which bookings are pending?",
+    "confirm the booking for John",
+    "confirm John-2024-01-01-Dayz",
+])
+def test_free_form_messages_fall_back_to_the_model(text):
+    assert _ADMIN_COMMAND_RE.match(text) is None
+
+
+def test_reject_without_reason_asks_for_one():
+    """A bare reject reaches the tool without reason=None and gets its error."""
+    agent = AdminAgent.__new__(AdminAgent)
+    command = _ADMIN_COMMAND_RE.match("reject Ali-2025-02-03-Night")
+
+    reply = asyncio.run(agent._run_command(command))
+
+    assert reply == "❌ Rejection reason is required"
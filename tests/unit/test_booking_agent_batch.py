@@ -0,0 +1,64 @@
+"""
+Unit tests for BookingToolAgent turn scheduling (get_response_batch, user-message saves).
+"""
+
+import asyncio
+
+from app.agents.booking_agent import BookingToolAgent
+
+
+class _RecordingAgent(BookingToolAgent):
+    """Skips model/graph setup; get_response just records overlap per session."""
+
+    def __init__(self):
+        self.active = {}
+        self.max_in_flight = 0
+
+    async def get_response(self, incoming_text, session_id, whatsapp_message_id=None):
+        self.active[session_id] = self.active.get(session_id, 0) + 1
+        assert self.active[session_id] == 1, "same-session turns overlapped"
+        self.max_in_flight = max(self.max_in_flight, sum(self.active.values()))
+        await asyncio.sleep(0.01)
+        self.active[session_id] -= 1
+        return f"{session_id}:{incoming_text}"
+
+
+def test_replies_keep_input_order_and_sessions_run_serially():
+    agent = _RecordingAgent()
+    items = [
+        ("a1", "s1", None),
+        ("b1", "s2", None),
+        ("a2", "s1", None),
+        ("c1", "s3", "wamid.1"),
+    ]
+
+    replies = asyncio.run(agent.get_response_batch(items))
+
+    assert replies == ["s1:a1", "s2:b1", "s1:a2", "s3:c1"]
+    assert agent.max_in_flight == 3
+
+
+def test_concurrency_is_capped():
+    agent = _RecordingAgent()
+    items = [(f"m{i}", f"s{i}", None) for i in range(6)]
+
+    asyncio.run(agent.get_response_batch(items, max_concurrency=2))
+
+    assert agent.max_in_flight == 2
+
+
+def test_failed_user_message_save_keeps_the_reply():
+    agent = BookingToolAgent.__new__(BookingToolAgent)
+
+    async def start_turn(incoming_text, session_id, whatsapp_message_id):
+        async def fail():
+            raise RuntimeError("db down")
+        return {}, None, asyncio.ensure_future(fail())
+
+    async def run_agent(incoming_text, session_id, user_context, memory_context):
+        return "booked"
+
+    agent._start_turn = start_turn
+    agent._run_agent = run_agent
+
+    assert asyncio.run(agent.get_response("book it", "s1")) == "booked"
@@ -0,0 +1,85 @@
+"""
+Unit tests for BookingToolNode tool-call scheduling.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from app.agents.tool_node import BookingToolNode, _group_tool_calls
+
+
+@tool
+def get_property_details(property_id: str) -> str:
+    """Read-only lookup."""
+    return f"details:{property_id}"
+
+
+@tool
+def get_property_images(property_id: str) -> str:
+    """Read-only lookup."""
+    return f"images:{property_id}"
+
+
+@tool
+def set_booking_preferences(property_id: str) -> str:
+    """State-changing tool."""
+    return f"prefs:{property_id}"
+
+
+def _calls(*names):
+    return [
+        {"name": name, "args": {"property_id": "p1"}, "id": str(i), "type": "tool_call"}
+        for i, name in enumerate(names)
+    ]
+
+
+def test_state_changing_tool_splits_read_only_batches():
+    """Read-only calls batch together; a writing tool runs on its own."""
+    calls = _calls(
+        "get_property_details",
+        "get_property_images",
+        "set_booking_preferences",
+        "get_property_details",
+    )
+    assert _group_tool_calls(calls) == [[0, 1], [2], [3]]
+
+
+def test_tool_messages_keep_tool_call_order():
+    """Both sync and async paths return ToolMessages in emitted order."""
+    node = BookingToolNode(
+        [get_property_details, get_property_images, set_booking_preferences],
+        concurrency_limit=2
+    )
+    state = {"messages": [AIMessage(content="", tool_calls=_calls(
+        "get_property_images",
+        "set_booking_preferences",
+        "get_property_details",
+    ))]}
+    expected = ["images:p1", "prefs:p1", "details:p1"]
+    
+    assert [m.content for m in node.invoke(state)["messages"]] == expected
+    assert [m.content for m in asyncio.run(node.ainvoke(state))["messages"]] == expected
+
+
+@tool
+async def get_property_videos(property_id: str) -> str:
+    """Read-only lookup that hangs."""
+    await asyncio.sleep(5)
+    return f"videos:{property_id}"
+
+
+def test_slow_tool_times_out_without_blocking_the_batch():
+    """A call over the timeout gets an error ToolMessage; the rest complete."""
+    node = BookingToolNode([get_property_details, get_property_videos], timeout=0.1)
+    state = {"messages": [AIMessage(content="", tool_calls=_calls(
+        "get_property_videos",
+        "get_property_details",
+    ))]}
+    
+    videos, details = asyncio.run(node.ainvoke(state))["messages"]
+    
+    assert videos.status == "error"
+    assert "get_property_videos" in videos.content
+    assert details.content == "details:p1"
@@ -0,0 +1,31 @@
+"""
+Unit tests for the message pre-checks in utility_tools.
+"""
+
+import pytest
+
+from app.agents.tools.utility_tools import is_greeting
+
+
+@pytest.mark.parametrize("message", [
+    "hi",
+    "Hi!",
+    "hello there",
+    "Salam",
+    "AOA",
+    "Assalam o Alaikum",
+    "assalamualaikum.",
+])
+def test_bare_greetings_are_detected(message):
+    assert is_greeting(message)
+
+
+@pytest.mark.parametrize("message", [
+    "hi I want a hut",
+    "hello, book hut for 5 people",
+    "salam, show farmhouses",
+    "which huts are available?",
+    "",
+])
+def test_greetings_with_a_request_are_not_short_circuited(message):
+    assert not is_greeting(message)